@@ -0,0 +1,211 @@
+"""
+Vectorized augmentation of (N, 30, 63) landmark feature sequences.
+
+Features are the wrist-centered, size-normalized landmarks from
+extract_features (21 x (x, y, z) per frame), so every transform works on
+the whole batch as one (N, 30, 21, 3) array: no per-sequence Python loops.
+
+  * rotation: random rotation about the camera axis (plus a smaller tilt
+    about x / y), one per sequence
+  * scale: per-sequence, per-axis scale jitter
+  * time warp: smooth random resampling of the 30 frames (signing speed)
+  * mirror: x -> -x (left / right hand)
+  * noise: Gaussian jitter on every coordinate
+
+Frames that are all zeros (no hand) stay zeros; time warping only
+interpolates between frames that have a hand.
+
+Augmented copies can be precomputed into a memory-mapped cache (see
+augmented_cache) so repeated training runs reuse them.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from feature_extractor import NUM_LANDMARKS
+
+CACHE_DIR = 'augmented'
+
+
+class Augmenter:
+    def __init__(self, rotate_deg=15.0, tilt_deg=5.0, scale=0.1, time_warp=0.2,
+                 mirror_prob=0.5, noise_std=0.01, seed=0):
+        self.rotate_deg = rotate_deg
+        self.tilt_deg = tilt_deg
+        self.scale = scale
+        self.time_warp = time_warp
+        self.mirror_prob = mirror_prob
+        self.noise_std = noise_std
+        self.seed = seed
+
+    def config(self):
+        return {
+            "rotate_deg": self.rotate_deg,
+            "tilt_deg": self.tilt_deg,
+            "scale": self.scale,
+            "time_warp": self.time_warp,
+            "mirror_prob": self.mirror_prob,
+            "noise_std": self.noise_std,
+            "seed": self.seed,
+        }
+
+    def config_hash(self):
+        return hashlib.sha1(json.dumps(self.config(), sort_keys=True).encode()).hexdigest()[:16]
+
+    def rotation_matrices(self, n, rng):
+        """(n, 3, 3): rotation about z by +-rotate_deg, then x / y by +-tilt_deg."""
+        az, ax, ay = (np.deg2rad(rng.uniform(-d, d, n)) for d in
+                      (self.rotate_deg, self.tilt_deg, self.tilt_deg))
+        m = np.zeros((n, 3, 3), dtype=np.float32)
+        cz, sz, cx, sx, cy, sy = np.cos(az), np.sin(az), np.cos(ax), np.sin(ax), np.cos(ay), np.sin(ay)
+        # Rz @ Ry @ Rx written out
+        m[:, 0, 0] = cz * cy
+        m[:, 0, 1] = cz * sy * sx - sz * cx
+        m[:, 0, 2] = cz * sy * cx + sz * sx
+        m[:, 1, 0] = sz * cy
+        m[:, 1, 1] = sz * sy * sx + cz * cx
+        m[:, 1, 2] = sz * sy * cx - cz * sx
+        m[:, 2, 0] = -sy
+        m[:, 2, 1] = cy * sx
+        m[:, 2, 2] = cy * cx
+        return m
+
+    def time_warp_indices(self, n, length, rng):
+        """
+        (n, length) fractional source frame per output frame: a random
+        monotonic curve through 0 and length - 1 (speed varies by +-time_warp).
+        """
+        t = np.linspace(0.0, 1.0, length)
+        # Random speed per sequence, plus a smooth bend in the middle
+        speed = rng.uniform(-self.time_warp, self.time_warp, (n, 1))
+        bend = rng.uniform(-self.time_warp, self.time_warp, (n, 1))
+        warped = t + speed * t * (1 - t) + bend * np.sin(np.pi * t) * t * (1 - t)
+        warped = np.maximum.accumulate(np.clip(warped, 0.0, 1.0), axis=1)
+        return warped * (length - 1)
+
+    def __call__(self, X, rng=None):
+        """
+        Augment a batch. X: (N, 30, 63). Returns a new float32 (N, 30, 63)
+        array; X is not modified.
+        """
+        rng = np.random.default_rng(self.seed) if rng is None else rng
+        X = np.asarray(X, dtype=np.float32)
+        n, length, _ = X.shape
+        pts = X.reshape(n, length, NUM_LANDMARKS, 3)
+        present = np.any(X != 0, axis=2)  # (N, 30) frames with a hand
+
+        if self.time_warp:
+            src = self.time_warp_indices(n, length, rng)
+            lo = np.floor(src).astype(np.intp)
+            hi = np.minimum(lo + 1, length - 1)
+            w = (src - lo).astype(np.float32)
+            rows = np.arange(n)[:, None]
+            # Interpolating into a missing frame would shrink the hand: take the present neighbour
+            lo_ok, hi_ok = present[rows, lo], present[rows, hi]
+            w[lo_ok & ~hi_ok] = 0.0
+            w[~lo_ok & hi_ok] = 1.0
+            w = w[:, :, None, None]
+            pts = (1 - w) * pts[rows, lo] + w * pts[rows, hi]
+            present = lo_ok | hi_ok
+        else:
+            pts = pts.copy()
+
+        if self.rotate_deg or self.tilt_deg:
+            # Batched matmul over all points of a sequence: (N, 630, 3) @ (N, 3, 3)^T
+            rot = self.rotation_matrices(n, rng)
+            pts = np.matmul(pts.reshape(n, -1, 3), rot.transpose(0, 2, 1)).reshape(n, length, NUM_LANDMARKS, 3)
+
+        if self.scale:
+            pts *= rng.uniform(1 - self.scale, 1 + self.scale, (n, 1, 1, 3)).astype(np.float32)
+
+        if self.mirror_prob:
+            flip = rng.random(n) < self.mirror_prob
+            pts[flip, :, :, 0] *= -1
+
+        if self.noise_std:
+            noise = rng.standard_normal(pts.shape, dtype=np.float32)
+            noise *= self.noise_std
+            pts += noise
+
+        out = pts.reshape(n, length, -1).astype(np.float32, copy=False)
+        out[~present] = 0.0
+        return out
+
+
+def _chunks(X, indices, chunk):
+    """X[indices] (or all of X) as float32 chunks, so a memmap is never read whole."""
+    n = len(X) if indices is None else len(indices)
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        rows = X[start:stop] if indices is None else X[indices[start:stop]]
+        yield start, np.asarray(rows, dtype=np.float32)
+
+
+def _fingerprint(X, indices, chunk):
+    """Hash of the source sequences."""
+    n = len(X) if indices is None else len(indices)
+    h = hashlib.sha1(repr((n,) + tuple(X.shape[1:])).encode())
+    for _, rows in _chunks(X, indices, chunk):
+        h.update(rows.tobytes())
+    return h.hexdigest()[:16]
+
+
+def augmented_cache(X, labels, augmenter, copies, cache_root, indices=None,
+                    include_original=True, chunk=4096):
+    """
+    Memory-mapped array of `copies` augmented versions of X[indices] (all of
+    X if indices is None; plus the originals first if include_original),
+    built once and reused while the augmenter config, copy count and source
+    data are unchanged. X may be a memmap: it is read chunk by chunk.
+
+    Written to <cache_root>/augmented/<key>/, key = hash of the config,
+    copies and source data. Returns: (sequences memmap (M, 30, 63), labels (M,))
+    """
+    labels = np.asarray(labels)
+    if indices is not None:
+        labels = labels[indices]
+    key = hashlib.sha1(json.dumps({
+        "config": augmenter.config_hash(),
+        "copies": copies,
+        "include_original": include_original,
+        "data": _fingerprint(X, indices, chunk),
+    }, sort_keys=True).encode()).hexdigest()[:16]
+    cache_dir = os.path.join(cache_root, CACHE_DIR, key)
+    seq_path = os.path.join(cache_dir, 'sequences.npy')
+    label_path = os.path.join(cache_dir, 'labels.npy')
+    meta_path = os.path.join(cache_dir, 'meta.json')
+
+    if os.path.exists(meta_path):
+        print(f"[augmentation] Reusing cache {cache_dir}")
+        return np.load(seq_path, mmap_mode='r'), np.load(label_path)
+
+    # Build in a temp dir, then rename: a half-written cache is never picked up
+    tmp_dir = cache_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    n = len(labels)
+    total = n * (copies + int(include_original))
+    out = np.lib.format.open_memmap(os.path.join(tmp_dir, 'sequences.npy'), mode='w+',
+                                    dtype=np.float32, shape=(total,) + tuple(X.shape[1:]))
+    rng = np.random.default_rng(augmenter.seed)
+    if include_original:
+        for start, rows in _chunks(X, indices, chunk):
+            out[start:start + len(rows)] = rows
+    for copy in range(copies):
+        offset = n * (copy + int(include_original))
+        for start, rows in _chunks(X, indices, chunk):
+            out[offset + start:offset + start + len(rows)] = augmenter(rows, rng)
+    out.flush()
+    del out
+    np.save(os.path.join(tmp_dir, 'labels.npy'), np.tile(labels, copies + int(include_original)))
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump({"config": augmenter.config(), "copies": copies,
+                   "include_original": include_original, "count": total}, f)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    print(f"[augmentation] Wrote {total} sequences to {cache_dir}")
+    return np.load(seq_path, mmap_mode='r'), np.load(label_path)
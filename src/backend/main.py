@@ -1,17 +1,22 @@
 # d:/aiProject/src/backend/main.py
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import cv2
 import asyncio
 import json
 import os
 import sys
+import time
 
 # Ensure d:/aiProject/src is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from engine import SignLanguageSystem
+from frame_pool import FramePool, LatestFrameSlot
+from mjpeg_stream import BOUNDARY, MJPEGBroadcaster
+from metrics import REGISTRY, STAGE_SECONDS, span
+import frame_protocol
 import base64
 import numpy as np
 
@@ -30,16 +35,110 @@ from contextlib import asynccontextmanager
 
 # Global system state
 system = None
+frame_pool = None
+broadcaster = None
 model_path = os.path.join(os.path.dirname(__file__), '..', '..', 'models', 'action.h5')
 actions = np.array(['Hello', 'ThankYou', 'Help', 'Please'])
 
+# Micro-batching: up to MAX_BATCH_SIZE windows per forward pass, waiting at most
+# MAX_WAIT_MS for more sessions to join a batch (0 = run whatever is pending).
+MAX_BATCH_SIZE = int(os.environ.get("SIGNFLOW_MAX_BATCH_SIZE", 32))
+MAX_WAIT_MS = float(os.environ.get("SIGNFLOW_MAX_WAIT_MS", 5))
+
+# Predict every INFERENCE_STRIDE landmark frames ("adaptive" = grow the stride
+# while the model is saturated, shrink it back when idle).
+INFERENCE_STRIDE = os.environ.get("SIGNFLOW_INFERENCE_STRIDE", "adaptive")
+
+# Stability hold in ms of frame time (same behaviour at any throughput).
+HOLD_MS = float(os.environ.get("SIGNFLOW_HOLD_MS", 300))
+
+# Model backend for batched inference: "keras", "numpy" (no TensorFlow import),
+# "tflite" / "tflite-<variant>" (quantized exports from src/export_model.py), or
+# "onnx" (ONNX Runtime on CPU, models/action.onnx from export_model.py --onnx).
+MODEL_BACKEND = os.environ.get("SIGNFLOW_MODEL_BACKEND", "keras")
+
+# ONNX Runtime thread pools (unset = runtime default). Keep intra-op threads
+# low when the frame workers need the cores.
+BACKEND_OPTIONS = {}
+if MODEL_BACKEND == "onnx":
+    for option, var in (("intra_op_threads", "SIGNFLOW_ONNX_INTRA_OP_THREADS"),
+                        ("inter_op_threads", "SIGNFLOW_ONNX_INTER_OP_THREADS")):
+        if os.environ.get(var):
+            BACKEND_OPTIONS[option] = int(os.environ[var])
+
+# Model worker processes (each loads the model once; windows and results go
+# through shared memory). 0 = run the model in the server process.
+MODEL_WORKERS = int(os.environ.get("SIGNFLOW_MODEL_WORKERS", 0))
+
+# SIGNFLOW_STREAMING=exact|approximate: per-session stateful LSTM (NumPy, one
+# step per frame) instead of batched windowed inference.
+STREAMING = os.environ.get("SIGNFLOW_STREAMING") or None
+
+# Frames larger than this are downscaled before MediaPipe ("WxH", empty = off).
+# The frontend already sends 320x240, which passes through untouched.
+INPUT_SIZE = os.environ.get("SIGNFLOW_INPUT_SIZE", "320x240")
+
+# ROI tracking crops MediaPipe input around the last hand. Frame workers are
+# shared by all clients, so it only pays off for few, high-resolution clients.
+ROI_TRACKING = os.environ.get("SIGNFLOW_ROI_TRACKING", "0") == "1"
+
+# Threads for decode + MediaPipe (one Hands instance each). 0 = inline on the event loop.
+FRAME_WORKERS = int(os.environ.get("SIGNFLOW_FRAME_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Legacy local mode: camera index / URL the server captures from for
+# /video_feed (unset = cloud mode, clients send frames over /ws).
+CAPTURE_SOURCE = os.environ.get("SIGNFLOW_CAPTURE_SOURCE") or None
+if CAPTURE_SOURCE is not None and CAPTURE_SOURCE.isdigit():
+    CAPTURE_SOURCE = int(CAPTURE_SOURCE)
+
+# Capture mode requested from the camera driver: "WxH", frames/sec and FOURCC
+# (MJPG lets most USB webcams do 720p+ at 30 fps). Unset = driver default.
+CAPTURE_OPTIONS = {}
+if os.environ.get("SIGNFLOW_CAPTURE_SIZE"):
+    CAPTURE_OPTIONS["width"], CAPTURE_OPTIONS["height"] = (
+        int(v) for v in os.environ["SIGNFLOW_CAPTURE_SIZE"].split("x"))
+if os.environ.get("SIGNFLOW_CAPTURE_FPS"):
+    CAPTURE_OPTIONS["fps"] = float(os.environ["SIGNFLOW_CAPTURE_FPS"])
+if os.environ.get("SIGNFLOW_CAPTURE_FOURCC"):
+    CAPTURE_OPTIONS["fourcc"] = os.environ["SIGNFLOW_CAPTURE_FOURCC"]
+
+# /video_feed JPEG quality, output box ("WxH", empty = as captured) and frame rate cap.
+STREAM_QUALITY = int(os.environ.get("SIGNFLOW_STREAM_QUALITY", 80))
+STREAM_SIZE = os.environ.get("SIGNFLOW_STREAM_SIZE", "")
+STREAM_MAX_FPS = float(os.environ.get("SIGNFLOW_STREAM_MAX_FPS", 30))
+
+# GET /debug/profile (sampling profiler capture) is only served when set to 1.
+PROFILER_ENABLED = os.environ.get("SIGNFLOW_PROFILER", "0") == "1"
+PROFILE_MAX_SECONDS = 60
+
+FRAMES_RECEIVED = REGISTRY.counter("signflow_frames_received_total", "Frames received over /ws.", ("format",))
+FRAMES_PROCESSED = REGISTRY.counter("signflow_frames_processed_total", "Frames answered over /ws.").labels()
+FRAME_ERRORS = REGISTRY.counter("signflow_frame_errors_total", "Frames that failed to parse or process.").labels()
+ACTIVE_SESSIONS = REGISTRY.gauge("signflow_active_sessions", "Open /ws connections (one session each).").labels()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global system
+    global system, frame_pool, broadcaster
     print(f"[Startup] Loading system from: {model_path}")
     try:
-        # CLOUD MODE: Pass capture_source=None so the server doesn't try to open a webcam.
-        system = SignLanguageSystem(model_path, actions, capture_source=None)
+        # CLOUD MODE (no SIGNFLOW_CAPTURE_SOURCE): capture_source=None so the server doesn't try to open a webcam.
+        adaptive = INFERENCE_STRIDE == "adaptive"
+        input_size = tuple(int(v) for v in INPUT_SIZE.split("x")) if INPUT_SIZE else None
+        system = SignLanguageSystem(model_path, actions, capture_source=CAPTURE_SOURCE,
+                                    capture_options=CAPTURE_OPTIONS,
+                                    max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+                                    inference_stride=1 if adaptive else int(INFERENCE_STRIDE),
+                                    adaptive_stride=adaptive, hold_ms=HOLD_MS,
+                                    streaming=STREAMING, backend=MODEL_BACKEND,
+                                    backend_options=BACKEND_OPTIONS, model_workers=MODEL_WORKERS,
+                                    # /ws responses carry text only: only draw for /video_feed
+                                    headless=CAPTURE_SOURCE is None, input_size=input_size,
+                                    roi_tracking=ROI_TRACKING)
+        frame_pool = FramePool(system.make_detector, workers=FRAME_WORKERS)
+        if system.camera is not None:
+            stream_size = tuple(int(v) for v in STREAM_SIZE.split("x")) if STREAM_SIZE else None
+            broadcaster = MJPEGBroadcaster(lambda: system.get_frame()[0], quality=STREAM_QUALITY,
+                                           size=stream_size, max_fps=STREAM_MAX_FPS)
         print("[Startup] System loaded successfully.")
     except Exception as e:
         print(f"[Startup] CRITICAL ERROR: Failed to load system: {e}")
@@ -48,80 +147,197 @@ async def lifespan(app: FastAPI):
     yield
     
     print("[Shutdown] Releasing system...")
+    if broadcaster:
+        broadcaster.close()
+    if frame_pool:
+        frame_pool.shutdown()
     if system:
         system.release()
 
 app = FastAPI(lifespan=lifespan)
 
-def generate_frames():
-    """Video streaming generator function (Legacy Local Mode)."""
+@app.get("/video_feed")
+async def video_feed():
+    """
+    Video streaming route (Legacy Local Mode, needs SIGNFLOW_CAPTURE_SOURCE).
+    Every viewer gets the same encoded frames from one shared producer.
+    """
+    if broadcaster is None:
+        return PlainTextResponse("no local camera (set SIGNFLOW_CAPTURE_SOURCE)\n", status_code=404)
+    return StreamingResponse(broadcaster.stream(), media_type=f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+
+@app.get("/stats")
+async def stats():
+    """Batch-size and queue-wait histograms of the shared PredictionEngine."""
+    if system is None:
+        return {"error": "Model not loaded"}
+    if system.predictor is None:
+        return {"streaming": STREAMING}
+    return system.predictor.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Stage latency histograms and counters, Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+_profile_lock = asyncio.Lock()
+
+@app.get("/debug/profile")
+async def debug_profile(seconds: float = 10.0, interval_ms: float = 5.0, format: str = "top"):
+    """
+    Sampling profiler capture over all threads (opt-in: SIGNFLOW_PROFILER=1).
+    format=top: functions by self time; format=collapsed: flamegraph stacks.
+    """
+    if not PROFILER_ENABLED:
+        return PlainTextResponse("profiler disabled (set SIGNFLOW_PROFILER=1)\n", status_code=404)
+    if _profile_lock.locked():
+        return PlainTextResponse("a capture is already running\n", status_code=409)
+    from profiler import SamplingProfiler
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=max(interval_ms, 1.0) / 1000.0)
+        profiler.start()
+        try:
+            await asyncio.sleep(min(max(seconds, 0.1), PROFILE_MAX_SECONDS))
+        finally:
+            profiler.stop()
+    return PlainTextResponse(profiler.collapsed() if format == "collapsed" else profiler.top())
+
+def process_packet(get_detector, session, header, packet, received):
+    """
+    Decode -> Hand Tracking -> Features / Prediction. Runs on a frame worker;
+    get_detector() returns that worker's detector (built on first image frame).
+    """
+    # Receive -> worker start: time in the connection slot and the pool queue
+    STAGE_SECONDS.labels("queued").observe(time.perf_counter() - received)
+
+    # Client-side landmark mode: skip decode + MediaPipe entirely
+    if header is not None and frame_protocol.is_landmarks(header):
+        with span("landmark_decode"):
+            _, landmarks = frame_protocol.decode_landmarks(packet)
+        return session.update(landmarks, timestamp=received)
+
+    # 1. Decode
+    if header is not None:
+        # Binary protocol: decode straight from the received buffer
+        with span("imdecode"):
+            _, img = frame_protocol.decode_image(packet)
+    else:
+        # Legacy JSON: base64 data URL
+        with span("base64_decode"):
+            encoded_data = packet["image"].split(',')[1]
+            nparr = np.frombuffer(base64.b64decode(encoded_data), np.uint8)
+        with span("imdecode"):
+            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    if img is None:
+        return session.sentence, {"class": None, "confidence": 0.0}
+    
+    # 2. Process (detector belongs to this worker thread)
+    _, lmList = system.detect_landmarks(img, detector=get_detector(), roi_state=session.roi_state)
+    return session.update(lmList, timestamp=received)
+
+def build_response(sentence, pred_data):
+    response = {
+        "sentence": " ".join(sentence),
+        "prediction": -1, # Deprecated for frontend, use class name below if needed
+        "confidence": pred_data["confidence"]
+    }
+    if pred_data["class"]:
+         # Find index for frontend compatibility if needed, or just send text
+         # Frontend expects 'prediction' index. Let's find it.
+         # This is a bit inefficient (search), but safe.
+         idx = np.where(actions == pred_data["class"])[0]
+         if len(idx) > 0:
+             response["prediction"] = int(idx[0])
+    return response
+
+async def process_frames(websocket, session, slot):
+    """Per-connection consumer: always works on the newest frame in the slot."""
     while True:
-        img, _, _ = system.get_frame()
-        if img is None:
+        header, packet, received = await slot.get()
+        try:
+            sentence, pred_data = await frame_pool.run(process_packet, session, header, packet, received)
+        except Exception as e:
+            FRAME_ERRORS.inc()
+            print(f"[WS] Frame Error: {e}")
+            # Still answer: the client only sends its next frame after a reply
+            response = {"error": f"Bad frame: {e}"}
+            if header is not None:
+                response["seq"] = header.seq
+            await websocket.send_json(response)
             continue
         
-        # Encode as JPEG
-        ret, buffer = cv2.imencode('.jpg', img)
-        frame = buffer.tobytes()
-        
-        # MJPEG format
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-
-@app.get("/video_feed")
-async def video_feed():
-    """Video streaming route (Legacy Local Mode)."""
-    return StreamingResponse(generate_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
+        # 3. Respond
+        response = build_response(sentence, pred_data)
+        if header is not None:
+            response["seq"] = header.seq
+        with span("ws_send"):
+            await websocket.send_json(response)
+        FRAMES_PROCESSED.inc()
+        STAGE_SECONDS.labels("frame_total").observe(time.perf_counter() - received)
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    ACTIVE_SESSIONS.inc()
     print(f"[WS] Client connected: {websocket.client}")
+    # Each client gets its own window / stability buffer / sentence;
+    # inference is batched across all sessions by the shared PredictionEngine.
+    session = system.create_session() if system else None
+    
+    # Backpressure: receiving never waits on processing. A frame that arrives
+    # while the previous one is still queued replaces it.
+    slot = LatestFrameSlot()
+    processor = asyncio.create_task(process_frames(websocket, session, slot)) if session else None
     try:
         while True:
-            # Wait for data from Client
-            data_in = await websocket.receive_text()
+            # Wait for data from Client (binary frames or legacy JSON text)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
             
+            if message.get("bytes") is not None:
+                if system is None:
+                     await websocket.send_json({"error": "Model not loaded"})
+                     continue
+                received = time.perf_counter()
+                try:
+                    header = frame_protocol.parse_header(message["bytes"])
+                except frame_protocol.ProtocolError as e:
+                    FRAME_ERRORS.inc()
+                    await websocket.send_json({"error": f"Bad frame: {e}"})
+                    continue
+                FRAMES_RECEIVED.labels("binary").inc()
+                slot.put((header, message["bytes"], received))
+                continue
+            
+            data_in = message.get("text")
             try:
                 # Check if it's JSON (Cloud Mode)
                 packet = json.loads(data_in)
-                
-                if "image" in packet:
-                    # Check if system is loaded
-                    if system is None:
-                         # Send error packet or ignore
-                         await websocket.send_json({"error": "Model not loaded"})
-                         continue
-
-                    # CLOUD MODE: Client sends image
-                    # 1. Decode Base64
-                    encoded_data = packet["image"].split(',')[1]
-                    nparr = np.frombuffer(base64.b64decode(encoded_data), np.uint8)
-                    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                    
-                    # 2. Process
-                    _, sentence, pred_data = system.process_frame(img)
-                    
-                    # 3. Respond
-                    response = {
-                        "sentence": " ".join(sentence),
-                        "prediction": -1, # Deprecated for frontend, use class name below if needed
-                        "confidence": pred_data["confidence"]
-                    }
-                    if pred_data["class"]:
-                         # Find index for frontend compatibility if needed, or just send text
-                         # Frontend expects 'prediction' index. Let's find it.
-                         # This is a bit inefficient (search), but safe.
-                         idx = np.where(actions == pred_data["class"])[0]
-                         if len(idx) > 0:
-                             response["prediction"] = int(idx[0])
-                             
-                    await websocket.send_json(response)
-                    
             except json.JSONDecodeError:
                 # Legacy polling fallback (if client sends empty triggers or old protocol)
                 # But we really expect JSON now.
-                pass
+                continue
+                
+            if "image" in packet:
+                # Check if system is loaded
+                if system is None:
+                     # Send error packet or ignore
+                     await websocket.send_json({"error": "Model not loaded"})
+                     continue
+
+                # CLOUD MODE: Client sends image, processed off the event loop
+                FRAMES_RECEIVED.labels("json").inc()
+                slot.put((None, packet, time.perf_counter()))
             
     except Exception as e:
         print(f"WebSocket Error: {e}")
+    finally:
+        ACTIVE_SESSIONS.dec()
+        if processor:
+            processor.cancel()
+        if session:
+            session.close()
+        if slot.dropped:
+            print(f"[WS] {websocket.client}: dropped {slot.dropped} stale frames")
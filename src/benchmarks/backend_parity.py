@@ -0,0 +1,108 @@
+"""
+Model backend parity and footprint.
+
+1. Parity: runs every recorded data/<Action>/*.npy sequence through each
+   backend and compares the probabilities with the Keras model.
+2. Footprint: for each backend, a fresh interpreter loads it and runs one
+   batch; reports cold-start time and peak RSS of that process.
+
+By default: keras, numpy, and the float exports that exist (onnx,
+tflite-float32; see export_model.py). Quantized TFLite variants need an
+explicit --backends and a looser --tolerance.
+
+    python src/benchmarks/backend_parity.py
+    python src/benchmarks/backend_parity.py --backends keras numpy
+    python src/benchmarks/backend_parity.py --backends onnx --onnx-threads 1 1
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ROOT = os.path.dirname(SRC)
+sys.path.append(SRC)
+
+from model_backends import load_backend
+
+# Runs in a fresh interpreter so import + load cost and RSS are not shared
+FOOTPRINT_SCRIPT = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+sys.path.append({src!r})
+import numpy as np
+from model_backends import load_backend
+model = load_backend({backend!r}, {model!r}, **{options!r})
+model(np.zeros((1, 30, 63), np.float32))
+elapsed = time.perf_counter() - t0
+try:
+    # VmHWM is per address space; ru_maxrss is inherited from the parent across exec on Linux
+    with open("/proc/self/status") as f:
+        rss_mb = next(int(l.split()[1]) for l in f if l.startswith("VmHWM")) / 1024.0
+except OSError:
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+print(json.dumps({{"startup_s": elapsed, "peak_rss_mb": rss_mb}}))
+"""
+
+
+def load_sequences(data_dir):
+    files = sorted(glob.glob(os.path.join(data_dir, '*', '*.npy')))
+    return np.stack([np.load(f) for f in files]).astype(np.float32)
+
+
+def default_backends(model_path):
+    base = os.path.splitext(model_path)[0]
+    exported = {"onnx": base + ".onnx", "tflite-float32": base + "_float32.tflite"}
+    return ["keras", "numpy"] + [name for name, path in exported.items() if os.path.exists(path)]
+
+
+def backend_options(name, args):
+    if name == "onnx" and args.onnx_threads:
+        return {"intra_op_threads": args.onnx_threads[0], "inter_op_threads": args.onnx_threads[1]}
+    return {}
+
+
+def footprint(backend, model_path, options):
+    script = FOOTPRINT_SCRIPT.format(src=SRC, backend=backend, model=model_path, options=options)
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(ROOT, 'models', 'action.h5'))
+    parser.add_argument("--data", default=os.path.join(ROOT, 'data'))
+    parser.add_argument("--backends", nargs="+", default=None)
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    parser.add_argument("--onnx-threads", type=int, nargs=2, metavar=("INTRA", "INTER"),
+                        help="ONNX Runtime intra-op / inter-op thread counts")
+    args = parser.parse_args()
+    args.backends = args.backends or default_backends(args.model)
+
+    X = load_sequences(args.data)
+    reference = load_backend("keras", args.model)(X)
+
+    failed = False
+    print(f"parity on {len(X)} sequences (reference: keras)")
+    for name in args.backends:
+        out = load_backend(name, args.model, **backend_options(name, args))(X)
+        diff = np.abs(out - reference).max()
+        agree = (out.argmax(1) == reference.argmax(1)).mean()
+        ok = diff <= args.tolerance
+        failed |= not ok
+        print(f"  {name:14} max |dp| {diff:.2e}  argmax agree {agree:.1%}  {'OK' if ok else 'FAIL'}")
+
+    print("cold start (fresh process, load + first batch)")
+    for name in args.backends:
+        stats = footprint(name, args.model, backend_options(name, args))
+        print(f"  {name:14} {stats['startup_s']:6.2f} s  peak RSS {stats['peak_rss_mb']:7.1f} MB")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Augmentation throughput in sequences/sec: each transform alone and all of
+them together, batched vs one sequence per call (what a per-sample Python
+augmentation step in the training loop would cost), plus the time to build
+and to reopen the memory-mapped cache.
+
+    python src/benchmarks/bench_augment.py --sequences 20000 --copies 4
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from augmentation import Augmenter, augmented_cache
+from feature_extractor import extract_features_batch
+
+ONLY = {
+    "rotate": dict(rotate_deg=15.0, tilt_deg=5.0),
+    "scale": dict(scale=0.1),
+    "time_warp": dict(time_warp=0.2),
+    "mirror": dict(mirror_prob=0.5),
+    "noise": dict(noise_std=0.01),
+}
+OFF = dict(rotate_deg=0, tilt_deg=0, scale=0, time_warp=0, mirror_prob=0, noise_std=0)
+
+
+def rate(fn, n):
+    t0 = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sequences", type=int, default=20000)
+    parser.add_argument("--copies", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=4096)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    hands = rng.random((args.sequences * 30, 21, 3), dtype=np.float32)
+    X = extract_features_batch(hands).reshape(args.sequences, 30, 63)
+
+    def batched(aug):
+        for start in range(0, len(X), args.batch):
+            aug(X[start:start + args.batch], rng)
+
+    for name, kwargs in list(ONLY.items()) + [("all", {})]:
+        aug = Augmenter(**{**OFF, **kwargs}) if kwargs else Augmenter()
+        print(f"{name:10} {rate(lambda: batched(aug), len(X)):>12,.0f} seq/s")
+
+    aug = Augmenter()
+    n_single = min(len(X), 2000)
+    single = rate(lambda: [aug(X[i:i + 1], rng) for i in range(n_single)], n_single)
+    print(f"{'all, 1/call':10} {single:>12,.0f} seq/s")
+
+    root = tempfile.mkdtemp(prefix="signflow-augment-")
+    try:
+        t0 = time.perf_counter()
+        cached, _ = augmented_cache(X, np.zeros(len(X), np.int32), aug, args.copies, root)
+        t_build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        augmented_cache(X, np.zeros(len(X), np.int32), aug, args.copies, root)
+        t_reuse = time.perf_counter() - t0
+        print(f"cache: {len(cached)} sequences built in {t_build:.2f}s "
+              f"({len(X) * args.copies / t_build:,.0f} augmented seq/s), reopened in {t_reuse:.2f}s")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
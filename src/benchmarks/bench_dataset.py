@@ -0,0 +1,83 @@
+"""
+Dataset load time: the data/<Action>/N.npy directory layout (one np.load per
+sequence, then np.array over the list) vs the packed format from
+dataset_loader.pack_data (one np.load(mmap_mode='r')).
+
+Synthetic sequences are written to a temporary directory, so this never
+touches the real data/ folder.
+
+    python src/benchmarks/bench_dataset.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dataset_loader import actions, append_packed, load_packed, pack_data
+
+
+def make_directory_layout(root, n, rng):
+    for action in actions:
+        os.makedirs(os.path.join(root, action), exist_ok=True)
+    for i in range(n):
+        action = actions[i % len(actions)]
+        np.save(os.path.join(root, action, f"{i}.npy"), rng.random((30, 63)))
+
+
+def load_directory(root):
+    """Same work as the directory branch of dataset_loader.load_data."""
+    label_map = {label: num for num, label in enumerate(actions)}
+    sequences, labels = [], []
+    for action in actions:
+        action_path = os.path.join(root, action)
+        for file_name in os.listdir(action_path):
+            if file_name.endswith('.npy'):
+                sequences.append(np.load(os.path.join(action_path, file_name)))
+                labels.append(label_map[action])
+    return np.array(sequences), np.array(labels)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--tmp", default=None, help="parent directory for the synthetic data")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'sequences':>10} {'directory':>11} {'packed open':>12} {'packed read':>12} {'pack':>9}")
+    for n in args.sizes:
+        root = tempfile.mkdtemp(prefix="signflow-data-", dir=args.tmp)
+        try:
+            make_directory_layout(root, n, rng)
+
+            t_pack, _ = timed(lambda: pack_data(root))
+            t_dir, (X_dir, _) = timed(lambda: load_directory(root))
+            t_open, (X, labels, _) = timed(lambda: load_packed(root))
+            # Touch every page, i.e. what one training epoch pays on top of open
+            t_read, _ = timed(lambda: float(np.asarray(X).sum(dtype=np.float64)))
+            assert X.shape == X_dir.shape
+
+            print(f"{n:>10} {t_dir * 1e3:>9.0f}ms {t_open * 1e3:>10.2f}ms "
+                  f"{t_read * 1e3:>10.0f}ms {t_pack:>8.1f}s")
+
+            # Incremental append of one more recording only writes that row
+            t_append, _ = timed(lambda: append_packed(rng.random((1, 30, 63)), [0], root))
+            print(f"{'':>10} append 1 sequence: {t_append * 1e3:.2f}ms")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-hand cost of feature extraction: the original list-based float64
+implementation vs the float32 single-hand path (with and without a
+caller-provided buffer) vs the batched (N, 21, 3) API.
+
+    python src/benchmarks/bench_features.py --hands 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from feature_extractor import extract_features, extract_features_batch
+
+
+def extract_features_original(lmList):
+    """The pre-float32 implementation, kept here as the baseline."""
+    if not lmList or len(lmList) != 21:
+        return np.zeros(63)
+    landmarks = np.array(lmList)
+    centered_landmarks = landmarks - landmarks[0]
+    distances = np.linalg.norm(centered_landmarks, axis=1)
+    max_dist = np.max(distances)
+    if max_dist > 0:
+        normalized_landmarks = centered_landmarks / max_dist
+    else:
+        normalized_landmarks = centered_landmarks
+    return normalized_landmarks.flatten()
+
+
+def per_hand_us(fn, items):
+    t0 = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - t0) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hands", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    hands = rng.random((args.hands, 21, 3), dtype=np.float32)
+    as_lists = hands.tolist()
+    out = np.empty(63, dtype=np.float32)
+
+    # Same numbers (up to float32 rounding)
+    reference = np.stack([extract_features_original(h) for h in as_lists[:100]])
+    assert np.allclose(extract_features_batch(hands[:100]), reference, atol=1e-5)
+
+    rows = [
+        ("original (list, float64)", per_hand_us(extract_features_original, as_lists)),
+        ("single (list)", per_hand_us(extract_features, as_lists)),
+        ("single (array)", per_hand_us(extract_features, hands)),
+        ("single (array, out=)", per_hand_us(lambda h: extract_features(h, out=out), hands)),
+    ]
+    t0 = time.perf_counter()
+    extract_features_batch(hands)
+    rows.append((f"batch (N={args.hands})", (time.perf_counter() - t0) / args.hands * 1e6))
+
+    baseline = rows[0][1]
+    for name, us in rows:
+        print(f"{name:28} {us:8.2f} us/hand  {baseline / us:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Frames/sec of ingest_videos for 1..N worker processes, on synthetic videos
+written to a temporary directory (each run ingests into a fresh dataset).
+
+    python src/benchmarks/bench_ingest.py --videos 16 --frames 120 --workers 1 2 4 8
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dataset_loader import actions
+from ingest_videos import ingest
+
+
+def write_videos(root, count, frames, size=(640, 480)):
+    rng = np.random.default_rng(0)
+    with open(os.path.join(root, "manifest.csv"), "w") as f:
+        f.write("path,label\n")
+        for i in range(count):
+            name = f"clip{i}.avi"
+            writer = cv2.VideoWriter(os.path.join(root, name), cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+            for _ in range(frames):
+                writer.write(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8))
+            writer.release()
+            f.write(f"{name},{actions[i % len(actions)]}\n")
+    return os.path.join(root, "manifest.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="signflow-ingest-")
+    try:
+        manifest = write_videos(root, args.videos, args.frames)
+        results = []
+        for workers in args.workers:
+            data = os.path.join(root, f"data-{workers}")
+            results.append((workers, ingest(manifest, data, workers)["fps"]))
+
+        print(f"\n{'workers':>8} {'fps':>8} {'speedup':>8}")
+        for workers, fps in results:
+            print(f"{workers:>8} {fps:>8.0f} {fps / results[0][1]:>7.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
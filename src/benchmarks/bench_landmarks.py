@@ -0,0 +1,80 @@
+"""
+Server CPU per client frame: image packets (decode + MediaPipe + features)
+vs client-side landmark packets (unpack + features).
+
+Uses process CPU time, so it reflects what a backend node pays per frame
+regardless of how many worker threads are involved.
+
+    python src/benchmarks/bench_landmarks.py --image hand.jpg --frames 300
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import frame_protocol
+from hand_tracking import HandDetector
+from feature_extractor import extract_features
+
+
+def cpu_us_per_frame(fn, messages):
+    t0 = time.process_time()
+    for msg in messages:
+        fn(msg)
+    return (time.process_time() - t0) / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", default=None, help="frame with a hand in it (default: synthetic noise)")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    if args.image:
+        img = cv2.resize(cv2.imread(args.image), (args.width, args.height))
+    else:
+        img = np.random.default_rng(0).integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    ok, jpeg = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 60])
+
+    detector = HandDetector(detectionCon=0.8, maxHands=1, modelComplexity=0)
+    detector.findHands(img.copy())
+    landmarks = detector.findPosition(img, draw=False)
+    if not landmarks:
+        print("No hand in the test frame; landmark packets use random landmarks.")
+        landmarks = np.random.default_rng(1).random((21, 3))
+
+    def image_path(msg):
+        _, frame = frame_protocol.decode_image(msg)
+        detector.findHands(frame)
+        extract_features(detector.findPosition(frame, draw=False))
+
+    def landmark_path(msg):
+        _, lm = frame_protocol.decode_landmarks(msg)
+        extract_features(lm)
+
+    image_msgs = [frame_protocol.pack_frame(jpeg.tobytes(), i, width=args.width, height=args.height)
+                  for i in range(args.frames)]
+    rows = [("image (jpeg)", image_msgs, image_path)]
+    for name, codec in [("landmarks f32", frame_protocol.CODEC_LANDMARKS_F32),
+                        ("landmarks f16", frame_protocol.CODEC_LANDMARKS_F16),
+                        ("landmarks i16", frame_protocol.CODEC_LANDMARKS_I16)]:
+        msgs = [frame_protocol.pack_landmarks(landmarks, i, codec=codec) for i in range(args.frames)]
+        rows.append((name, msgs, landmark_path))
+
+    baseline = None
+    print(f"{'packet':14} {'bytes':>7} {'cpu us/frame':>13} {'reduction':>10}")
+    for name, msgs, fn in rows:
+        us = cpu_us_per_frame(fn, msgs)
+        baseline = baseline or us
+        print(f"{name:14} {len(msgs[0]):>7} {us:>13.1f} {baseline / us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Windows/sec of PredictionEngine with the model in-process (0) and in 1..N
+worker processes (model_pool), submitting a fixed set of windows as fast
+as possible. Expect near-linear scaling up to the number of physical cores.
+
+    python src/benchmarks/bench_model_pool.py --workers 0 1 2 4 --windows 4096
+    python src/benchmarks/bench_model_pool.py --backend numpy --crash-test
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(SRC)
+
+from engine import PredictionEngine
+
+ACTIONS = np.array(['Hello', 'ThankYou', 'Help', 'Please'])
+
+
+def throughput(engine, windows):
+    engine.submit(windows[0]).result(timeout=300)  # wait for load + warm-up
+    t0 = time.perf_counter()
+    futures = [engine.submit(w) for w in windows]
+    for f in futures:
+        f.result()
+    return len(windows) / (time.perf_counter() - t0)
+
+
+def crash_test(args, windows):
+    """Kill a worker process mid-run: its batch fails, the pool restarts it, later calls succeed."""
+    engine = PredictionEngine(args.model, ACTIONS, max_batch_size=args.batch_size,
+                              backend=args.backend, model_workers=1)
+    try:
+        engine.submit(windows[0]).result(timeout=300)
+        worker = engine.pool.worker(0)
+        worker.process.kill()
+        worker.process.join()
+        failed = engine.submit(windows[0]).exception(timeout=60)
+        print(f"call on killed worker: {type(failed).__name__}: {failed}")
+        probs = engine.submit(windows[0]).result(timeout=300)
+        print(f"after restart: ok, probs {np.round(probs, 3)}")
+    finally:
+        engine.stop()
+        engine.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(os.path.dirname(SRC), 'models', 'action.h5'))
+    parser.add_argument("--backend", default="keras")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--windows", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--crash-test", action="store_true", help="also check restart after a worker crash")
+    args = parser.parse_args()
+
+    windows = np.random.default_rng(0).normal(0, 0.3, (args.windows, 30, 63)).astype(np.float32)
+    results = []
+    for workers in args.workers:
+        engine = PredictionEngine(args.model, ACTIONS, max_batch_size=args.batch_size,
+                                  backend=args.backend, model_workers=workers)
+        try:
+            results.append((workers, throughput(engine, windows)))
+        finally:
+            engine.stop()
+            engine.join()
+
+    print(f"\n{os.cpu_count()} CPUs, backend {args.backend}, batch {args.batch_size}")
+    print(f"{'workers':>8} {'windows/s':>10} {'speedup':>8}")
+    for workers, wps in results:
+        print(f"{workers:>8} {wps:>10.0f} {wps / results[0][1]:>7.1f}x")
+
+    if args.crash_test:
+        crash_test(args, windows)
+
+
+if __name__ == "__main__":
+    main()
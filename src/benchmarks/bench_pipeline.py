@@ -0,0 +1,81 @@
+"""
+Training input throughput (samples/sec) and memory of the streaming
+data_pipeline vs the in-memory path (whole dataset as NumPy arrays, what
+train_model did before). Run once per mode / size.
+
+    python src/benchmarks/bench_pipeline.py --sequences 100000
+    python src/benchmarks/bench_pipeline.py --sequences 100000 --in-memory
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dataset_loader import actions, append_packed, load_packed
+from data_pipeline import make_datasets, measure_throughput
+
+
+def status_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def write_packed(root, n, chunk=4096):
+    rng = np.random.default_rng(0)
+    for start in range(0, n, chunk):
+        count = min(chunk, n - start)
+        append_packed(rng.random((count, 30, 63), dtype=np.float32),
+                      rng.integers(0, len(actions), count), root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sequences", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--in-memory", action="store_true", help="load everything into RAM instead")
+    parser.add_argument("--data", default=None, help="existing data dir with a packed/ dataset")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    root = args.data or tempfile.mkdtemp(prefix="signflow-pipeline-")
+    try:
+        if args.data is None:
+            write_packed(root, args.sequences)
+        anon_before = status_mb("RssAnon")
+        anon_peak = anon_before
+
+        if args.in_memory:
+            X, labels, meta = load_packed(root, mmap=False)
+            y = tf.one_hot(labels, len(meta["actions"]))
+            train_ds = tf.data.Dataset.from_tensor_slices((X, y)).shuffle(len(X)).batch(args.batch_size)
+            n = len(X)
+        else:
+            train_ds, _, info = make_datasets(root, batch_size=args.batch_size)
+            n = info["train_size"]
+
+        for epoch in range(args.epochs):
+            rate = measure_throughput(train_ds)
+            anon_peak = max(anon_peak, status_mb("RssAnon"))
+            print(f"epoch {epoch}: {rate:,.0f} samples/sec")
+        mode = "in-memory" if args.in_memory else "streaming"
+        # Memmapped pages show up in VmHWM but are file-backed page cache the
+        # kernel can drop; RssAnon is the memory the process actually owns.
+        print(f"{mode}: {n} train sequences, anonymous RSS +{anon_peak - anon_before:.0f} MB "
+              f"over the pre-load baseline (VmHWM {status_mb('VmHWM'):.0f} MB)")
+    finally:
+        if args.data is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Micro-benchmark: legacy base64-in-JSON frames vs the binary frame protocol.
+
+Reports bytes on the wire per frame and server-side decode time, split into
+"unwrap" (message -> uint8 buffer) and "full" (unwrap + cv2.imdecode).
+
+    python src/benchmarks/bench_protocol.py --width 640 --height 480
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import frame_protocol
+
+
+def synthetic_jpeg(width, height, quality):
+    # Smooth gradient + noise compresses roughly like a webcam frame
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    img = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=-1)
+    img = np.clip(img + rng.normal(0, 8, img.shape), 0, 255).astype(np.uint8)
+    ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes()
+
+
+def unwrap_json(message):
+    packet = json.loads(message)
+    encoded_data = packet["image"].split(',')[1]
+    return np.frombuffer(base64.b64decode(encoded_data), np.uint8)
+
+
+def unwrap_binary(message):
+    frame_protocol.parse_header(message)
+    return frame_protocol.payload_view(message)
+
+
+def timeit(fn, arg, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - t0) / repeat * 1e6  # us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--quality", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    jpeg = synthetic_jpeg(args.width, args.height, args.quality)
+    json_msg = json.dumps({"image": "data:image/jpeg;base64," + base64.b64encode(jpeg).decode()})
+    bin_msg = frame_protocol.pack_frame(jpeg, seq=1, width=args.width, height=args.height)
+
+    rows = [
+        ("json", len(json_msg.encode()), unwrap_json, json_msg),
+        ("binary", len(bin_msg), unwrap_binary, bin_msg),
+    ]
+    print(f"{args.width}x{args.height} q={args.quality}, JPEG payload {len(jpeg)} bytes")
+    print(f"{'path':8} {'wire bytes':>10} {'unwrap us':>10} {'full us':>10}")
+    for name, size, unwrap, msg in rows:
+        unwrap_us = timeit(unwrap, msg, args.repeat)
+        full_us = timeit(lambda m: cv2.imdecode(unwrap(m), cv2.IMREAD_COLOR), msg, args.repeat)
+        print(f"{name:8} {size:>10} {unwrap_us:>10.1f} {full_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
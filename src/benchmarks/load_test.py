@@ -0,0 +1,87 @@
+"""
+WebSocket load test for the /ws endpoint.
+
+Opens N simulated clients that behave like the React frontend (send a frame,
+wait for the reply, send the next one) and reports round-trip latency.
+
+    # server under test
+    uvicorn src.backend.main:app
+    python src/benchmarks/load_test.py --clients 8 --frames 200
+
+To compare before/after, run the server once with SIGNFLOW_FRAME_WORKERS=0
+(frames processed inline on the event loop) and once with the default pool.
+--binary sends frames with the binary protocol instead of base64 JSON.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import websockets
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import frame_protocol
+
+
+def make_jpeg(image_path=None, width=320, height=240, quality=60):
+    if image_path:
+        img = cv2.imread(image_path)
+        img = cv2.resize(img, (width, height))
+    else:
+        rng = np.random.default_rng(0)
+        img = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes()
+
+
+def make_message(jpeg, binary=False, width=320, height=240):
+    """Binary protocol frame, or the legacy JSON data URL (canvas.toDataURL)."""
+    if binary:
+        return frame_protocol.pack_frame(jpeg, seq=0, width=width, height=height)
+    return json.dumps({"image": "data:image/jpeg;base64," + base64.b64encode(jpeg).decode()})
+
+
+async def client(url, message, frames, latencies):
+    async with websockets.connect(url, max_size=None) as ws:
+        for _ in range(frames):
+            t0 = time.perf_counter()
+            await ws.send(message)
+            await ws.recv()
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+
+
+async def run(url, clients, frames, message):
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(url, message, frames, latencies) for _ in range(clients)))
+    elapsed = time.perf_counter() - t0
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://localhost:8000/ws")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=200, help="frames per client")
+    parser.add_argument("--image", default=None, help="JPEG/PNG to send (default: synthetic noise)")
+    parser.add_argument("--binary", action="store_true", help="use the binary frame protocol")
+    args = parser.parse_args()
+
+    message = make_message(make_jpeg(args.image), binary=args.binary)
+    latencies, elapsed = asyncio.run(run(args.url, args.clients, args.frames, message))
+
+    lat = np.array(latencies)
+    print(f"clients={args.clients} frames={len(lat)} elapsed={elapsed:.2f}s "
+          f"throughput={len(lat) / elapsed:.1f} frames/s")
+    print(f"latency ms: p50={np.percentile(lat, 50):.1f} p99={np.percentile(lat, 99):.1f} "
+          f"max={lat.max():.1f}")
+
+
+if __name__ == "__main__":
+    main()
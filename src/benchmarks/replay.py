@@ -0,0 +1,234 @@
+"""
+Replay benchmark: recorded inputs at unthrottled speed through each stage of
+the pipeline, with a JSON baseline to catch regressions.
+
+Inputs
+  * data/<Action>/*.npy landmark sequences (--data)
+  * JPEG frames: *.jpg in --frames-dir, or --synthetic N generated ones
+
+Stages (each timed per call)
+  features       extract_features on every recorded frame
+  session        SignSession.update frame by frame (features, dispatch,
+                 result logic; the model runs in the background)
+  engine         PredictionEngine round trip for one window at a time
+  engine_batch   every window submitted at once (micro-batching throughput;
+                 latency = submit -> result)
+  decode         cv2.imdecode of the JPEG frames
+  process_frame  SignLanguageSystem.process_frame on the decoded frames
+                 (MediaPipe; skipped with a note if it is not installed)
+
+Reports frames/sec and p50/p95/p99 latency per stage plus peak RSS.
+
+    python src/benchmarks/replay.py --save-baseline baseline.json
+    python src/benchmarks/replay.py --compare baseline.json --threshold 0.15
+
+With --compare the exit code is 1 when any stage's p95 latency or
+throughput, or the peak RSS, is worse than the baseline by more than
+--threshold (a fraction).
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ROOT = os.path.dirname(SRC)
+sys.path.append(SRC)
+
+from feature_extractor import extract_features
+
+ACTIONS = np.array(['Hello', 'ThankYou', 'Help', 'Please'])
+
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmHWM")) / 1024.0
+    except (OSError, StopIteration):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def summarize(latencies, wall=None):
+    """latencies in seconds; wall: total seconds for throughput (default: sum)."""
+    ms = np.asarray(latencies) * 1e3
+    wall = wall if wall is not None else float(np.sum(latencies))
+    return {
+        "count": int(len(ms)),
+        "fps": len(ms) / wall if wall > 0 else 0.0,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def timed_calls(fn, items):
+    latencies = []
+    for item in items:
+        t0 = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def load_sequences(data_dir):
+    files = sorted(glob.glob(os.path.join(data_dir, '*', '*.npy')))
+    if not files:
+        raise SystemExit(f"no recorded sequences under {data_dir}")
+    return np.stack([np.load(f) for f in files]).astype(np.float32)
+
+
+def load_jpegs(frames_dir, synthetic, width=640, height=480):
+    if frames_dir:
+        paths = sorted(glob.glob(os.path.join(frames_dir, '*.jpg')))
+        return [open(p, 'rb').read() for p in paths]
+    rng = np.random.default_rng(0)
+    jpegs = []
+    for i in range(synthetic):
+        # Smooth gradient + noise: compresses like a camera frame, unlike pure noise
+        base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None] * np.ones((height, 1, 3), np.float32)
+        img = np.clip(base + rng.normal(0, 20, (height, width, 3)), 0, 255).astype(np.uint8)
+        jpegs.append(cv2.imencode('.jpg', np.roll(img, i * 7, axis=1))[1].tobytes())
+    return jpegs
+
+
+def bench_model_stages(args, sequences, results):
+    from engine import PredictionEngine
+
+    engine = PredictionEngine(args.model, ACTIONS, max_batch_size=args.batch_size, backend=args.backend)
+    try:
+        engine.submit(sequences[0]).result(timeout=120)  # load + warm up
+
+        results["engine"] = summarize(timed_calls(lambda w: engine.submit(w).result(), sequences))
+
+        windows = np.concatenate([sequences] * args.batch_repeats)
+        t0 = time.perf_counter()
+        futures = [(engine.submit(w), time.perf_counter()) for w in windows]
+        latencies = [(f.result(), time.perf_counter() - t_submit)[1] for f, t_submit in futures]
+        results["engine_batch"] = summarize(latencies, wall=time.perf_counter() - t0)
+    finally:
+        engine.stop()
+
+
+def bench_system(args, sequences, jpegs, results, notes):
+    from engine import SignLanguageSystem
+
+    # The hand detector (MediaPipe) is only built on the first process_frame
+    system = SignLanguageSystem(args.model, ACTIONS, capture_source=None, backend=args.backend,
+                                max_batch_size=args.batch_size, headless=True)
+    try:
+        session = system.create_session()
+        frames = sequences.reshape(-1, 21, 3)
+        results["session"] = summarize(timed_calls(session.update, frames))
+        session.close()
+
+        if jpegs:
+            frames = [cv2.imdecode(np.frombuffer(j, np.uint8), cv2.IMREAD_COLOR) for j in jpegs]
+            try:
+                system.process_frame(frames[0])  # MediaPipe graph warm-up
+            except ImportError as e:
+                notes.append(f"process_frame skipped: {e}")
+                return
+            results["process_frame"] = summarize(timed_calls(system.process_frame, frames))
+    finally:
+        system.release()
+
+
+def run(args):
+    sequences = load_sequences(args.data)
+    jpegs = load_jpegs(args.frames_dir, args.synthetic)
+    results, notes = {}, []
+
+    frames = sequences.reshape(-1, 21, 3)
+    out = np.empty(63, np.float32)
+    results["features"] = summarize(timed_calls(lambda lm: extract_features(lm, out=out), frames))
+
+    if jpegs:
+        results["decode"] = summarize(timed_calls(
+            lambda j: cv2.imdecode(np.frombuffer(j, np.uint8), cv2.IMREAD_COLOR), jpegs))
+
+    bench_model_stages(args, sequences, results)
+    bench_system(args, sequences, jpegs, results, notes)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "config": {"backend": args.backend, "batch_size": args.batch_size,
+                   "sequences": int(len(sequences)), "jpegs": len(jpegs)},
+        "stages": results,
+        "peak_rss_mb": peak_rss_mb(),
+        "notes": notes,
+    }
+
+
+def print_report(report):
+    print(f"\n{'stage':14} {'count':>7} {'fps':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, s in report["stages"].items():
+        print(f"{name:14} {s['count']:>7} {s['fps']:>10.1f} {s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} {s['p99_ms']:>9.3f}")
+    print(f"peak RSS {report['peak_rss_mb']:.0f} MB")
+    for note in report["notes"]:
+        print(f"note: {note}")
+
+
+def compare(report, baseline, threshold):
+    """Returns: list of regression messages (empty = pass)."""
+    regressions = []
+    for name, base in baseline["stages"].items():
+        cur = report["stages"].get(name)
+        if cur is None:
+            continue
+        if cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.3f} -> {cur['p95_ms']:.3f} ms")
+        if cur["fps"] < base["fps"] * (1 - threshold):
+            regressions.append(f"{name}: fps {base['fps']:.1f} -> {cur['fps']:.1f}")
+    if report["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + threshold):
+        regressions.append(f"peak RSS {baseline['peak_rss_mb']:.0f} -> {report['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(ROOT, 'models', 'action.h5'))
+    parser.add_argument("--data", default=os.path.join(ROOT, 'data'))
+    parser.add_argument("--backend", default="keras")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batch-repeats", type=int, default=4,
+                        help="engine_batch submits the recorded windows this many times")
+    parser.add_argument("--frames-dir", default=None, help="directory of recorded *.jpg frames")
+    parser.add_argument("--synthetic", type=int, default=100, help="synthetic JPEGs when no --frames-dir")
+    parser.add_argument("--output", default=None, help="write this run's report as JSON")
+    parser.add_argument("--save-baseline", default=None, help="write this run as the new baseline")
+    parser.add_argument("--compare", default=None, help="baseline JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"wrote {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"REGRESSION (> {args.threshold:.0%} vs {args.compare}):")
+            for r in regressions:
+                print(f"  {r}")
+            sys.exit(1)
+        print(f"OK: within {args.threshold:.0%} of {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
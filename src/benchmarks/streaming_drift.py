@@ -0,0 +1,94 @@
+"""
+Equivalence check for the streaming LSTM engine.
+
+Replays the recorded data/<Action>/*.npy sequences back to back as one long
+landmark stream and, at every frame once the window is full, compares the
+streaming output with windowed inference over the last 30 frames.
+Reports max / mean absolute probability drift, argmax agreement and the
+per-frame cost of each mode.
+
+    python src/benchmarks/streaming_drift.py
+    python src/benchmarks/streaming_drift.py --keras   # reference = Keras model
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from numpy_lstm import NumpyLSTMModel, StreamingLSTM
+from ring_buffer import FeatureRingBuffer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def load_stream(data_dir):
+    files = sorted(glob.glob(os.path.join(data_dir, '*', '*.npy')))
+    return np.concatenate([np.load(f) for f in files]).astype(np.float32)
+
+
+def windowed_reference(predict, stream, length):
+    windows = np.lib.stride_tricks.sliding_window_view(stream, (length, stream.shape[1]))[:, 0]
+    t0 = time.perf_counter()
+    out = np.concatenate([predict(windows[i:i + 256]) for i in range(0, len(windows), 256)])
+    return out, time.perf_counter() - t0
+
+
+def run_streaming(streamer, stream, length):
+    state = streamer.new_state()
+    window = FeatureRingBuffer(length, stream.shape[1])
+    outputs = []
+    t0 = time.perf_counter()
+    for frame in stream:
+        window.append(frame)
+        if window.is_full():
+            outputs.append(streamer.step(state, frame, window))
+    return np.stack(outputs), time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(ROOT, 'models', 'action.h5'))
+    parser.add_argument("--data", default=os.path.join(ROOT, 'data'))
+    parser.add_argument("--keras", action="store_true", help="use the Keras model as the windowed reference")
+    args = parser.parse_args()
+
+    length = 30
+    stream = load_stream(args.data)
+    model = NumpyLSTMModel.from_h5(args.model)
+    frames = len(stream) - length + 1
+
+    if args.keras:
+        import tensorflow as tf
+        keras_model = tf.keras.models.load_model(args.model)
+        reference, _ = windowed_reference(lambda x: keras_model(x, training=False).numpy(), stream, length)
+    else:
+        reference, _ = windowed_reference(model, stream, length)
+
+    # Per-frame cost of windowed inference at batch size 1 (what a session pays today)
+    sample = np.lib.stride_tricks.sliding_window_view(stream, (length, stream.shape[1]))[:200, 0]
+    t0 = time.perf_counter()
+    for w in sample:
+        model(w[None])
+    window_us = (time.perf_counter() - t0) / len(sample) * 1e6
+
+    print(f"{frames} frames, windowed batch-1 cost {window_us:.0f} us/frame")
+    print(f"{'mode':22} {'max |dp|':>9} {'mean |dp|':>10} {'argmax agree':>13} {'us/frame':>9} {'speedup':>8}")
+    configs = [("exact", "exact", 1), ("approximate k=3", "approximate", 3),
+               ("approximate k=5", "approximate", 5), ("approximate k=10", "approximate", 10),
+               ("approximate k=30", "approximate", 30)]
+    for name, mode, reseed in configs:
+        streamer = StreamingLSTM(model, mode=mode, reseed_every=reseed)
+        out, elapsed = run_streaming(streamer, stream, length)
+        diff = np.abs(out - reference)
+        agree = (out.argmax(1) == reference.argmax(1)).mean()
+        us = elapsed / frames * 1e6
+        print(f"{name:22} {diff.max():>9.4f} {diff.mean():>10.5f} {agree:>12.1%} {us:>9.0f} {window_us / us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
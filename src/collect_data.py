@@ -20,6 +20,7 @@ sequence_length = 30
 
 def collect_data(action_name):
     detector = HandDetector(detectionCon=0.8, maxHands=1)
+    lm_buffer = np.empty((21, 3), dtype=np.float32) # Reused every frame
     cap = cv2.VideoCapture(0)
     
     # Create folder for action if it doesn't exist
@@ -48,9 +49,9 @@ def collect_data(action_name):
             if not success: continue
             
             img = detector.findHands(img)
-            lmList = detector.findPosition(img, draw=False)
+            lmList = detector.findPositionArray(out=lm_buffer)
             
-            if lmList:
+            if lmList is not None:
                 features = extract_features(lmList)
                 window.append(features)
                 
@@ -0,0 +1,134 @@
+"""
+Streaming tf.data input pipeline over the packed dataset (see
+dataset_loader.pack_data), for training sets that do not fit in RAM.
+
+The packed sequences are memory-mapped and read one shard (a run of
+consecutive rows) at a time in parallel, shuffled through a bounded buffer,
+batched and prefetched. Peak memory is set by shard_size, shuffle_buffer and
+batch_size, not by the dataset size (only the int labels / indices, a few
+bytes per sequence, are held in memory).
+
+    train_ds, val_ds, info = make_datasets(DATA_PATH)
+    model.fit(train_ds, validation_data=val_ds, ...)
+"""
+import os
+import time
+
+import numpy as np
+
+from dataset_loader import DATA_PATH, PACKED_DIR, load_packed, refresh_packed
+
+SHARD_SIZE = 256
+SHUFFLE_BUFFER = 4096
+BATCH_SIZE = 32
+
+
+def stratified_split(labels, val_fraction=0.1, seed=0):
+    """
+    Deterministic per-class train/validation split.
+    Returns: (train_indices, val_indices), each sorted so shards read
+    nearly sequential rows from the memmap.
+    """
+    labels = np.asarray(labels)
+    rng = np.random.default_rng(seed)
+    train, val = [], []
+    for cls in np.unique(labels):
+        idx = np.flatnonzero(labels == cls)
+        rng.shuffle(idx)
+        # At least one validation sample per class when the class has >1 sample
+        n_val = int(round(len(idx) * val_fraction))
+        if val_fraction > 0 and len(idx) > 1:
+            n_val = max(n_val, 1)
+        val.append(idx[:n_val])
+        train.append(idx[n_val:])
+    return np.sort(np.concatenate(train)), np.sort(np.concatenate(val))
+
+
+def make_dataset(sequences, labels, indices, num_classes, batch_size=BATCH_SIZE,
+                 shuffle=True, shard_size=SHARD_SIZE, shuffle_buffer=SHUFFLE_BUFFER, seed=0):
+    """
+    tf.data.Dataset of (batch, 30, 63) float32 / (batch, num_classes) one-hot
+    over sequences[indices], read lazily from the (memory-mapped) array.
+    """
+    import tensorflow as tf
+
+    indices = np.asarray(indices, dtype=np.int64)
+    shards = [indices[i:i + shard_size] for i in range(0, len(indices), shard_size)]
+    seq_shape = tuple(sequences.shape[1:])
+
+    def read_shard(shard_id):
+        idx = shards[int(shard_id)]
+        # Fancy indexing copies only these rows out of the memmap
+        return np.asarray(sequences[idx], dtype=np.float32), np.asarray(labels[idx], dtype=np.int32)
+
+    def load(shard_id):
+        x, y = tf.numpy_function(read_shard, [shard_id], (tf.float32, tf.int32))
+        x.set_shape((None,) + seq_shape)
+        y.set_shape((None,))
+        return x, y
+
+    ds = tf.data.Dataset.range(len(shards))
+    if shuffle:
+        # Shard order and sample order both change every epoch, reproducibly for a given seed
+        ds = ds.shuffle(len(shards), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.map(load, num_parallel_calls=tf.data.AUTOTUNE).unbatch()
+    if shuffle:
+        ds = ds.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size)
+    # unbatch() hides the size from Keras; restore it so fit() knows the epoch length
+    ds = ds.apply(tf.data.experimental.assert_cardinality(-(-len(indices) // batch_size)))
+    ds = ds.map(lambda x, y: (x, tf.one_hot(y, num_classes)), num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def make_datasets(data_path=DATA_PATH, val_fraction=0.1, batch_size=BATCH_SIZE, seed=0,
+                  augment_copies=0, augmenter=None, **kwargs):
+    """
+    Train / validation datasets over the packed data at data_path.
+    augment_copies > 0: train on the training split plus that many augmented
+    copies of it, precomputed once into a memory-mapped cache under
+    <data>/packed/augmented/ (see augmentation.augmented_cache). The
+    validation split is never augmented.
+    Returns: (train_ds, val_ds, info) or (None, None, None) if not packed.
+    info: dict with actions, num_classes, train_size, val_size.
+    """
+    refresh_packed(data_path)  # recordings added / changed since packing
+    sequences, labels, meta = load_packed(data_path)
+    if sequences is None:
+        return None, None, None
+
+    labels = np.asarray(labels)
+    num_classes = len(meta["actions"])
+    train_idx, val_idx = stratified_split(labels, val_fraction, seed)
+    if augment_copies:
+        from augmentation import Augmenter, augmented_cache
+        train_seqs, train_labels = augmented_cache(
+            sequences, labels, augmenter or Augmenter(seed=seed), augment_copies,
+            os.path.join(data_path, PACKED_DIR), indices=train_idx)
+        train_ds = make_dataset(train_seqs, train_labels, np.arange(len(train_labels)), num_classes,
+                                batch_size, shuffle=True, seed=seed, **kwargs)
+    else:
+        train_labels = train_idx
+        train_ds = make_dataset(sequences, labels, train_idx, num_classes, batch_size,
+                                shuffle=True, seed=seed, **kwargs)
+    val_ds = make_dataset(sequences, labels, val_idx, num_classes, batch_size,
+                          shuffle=False, **kwargs)
+    info = {
+        "actions": meta["actions"],
+        "num_classes": num_classes,
+        "train_size": len(train_labels),
+        "val_size": len(val_idx),
+    }
+    return train_ds, val_ds, info
+
+
+def measure_throughput(dataset, max_batches=None):
+    """Iterate the dataset once (or max_batches). Returns: samples/sec."""
+    samples = 0
+    t0 = time.perf_counter()
+    for i, (x, _) in enumerate(dataset):
+        samples += int(x.shape[0])
+        if max_batches is not None and i + 1 >= max_batches:
+            break
+    elapsed = time.perf_counter() - t0
+    return samples / elapsed if elapsed > 0 else float("inf")
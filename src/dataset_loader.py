@@ -1,38 +1,349 @@
 import numpy as np
 import os
-from tensorflow.keras.utils import to_categorical
+import json
+import struct
 from sklearn.model_selection import train_test_split
 
 DATA_PATH = os.path.join('d:/aiProject/data')
 actions = np.array(['Hello', 'ThankYou', 'Help', 'Please']) # Should match collect_data
 
-def load_data():
+# Packed layout (see pack_data): one memory-mappable file per array instead of
+# one .npy per recorded sequence.
+#   <data>/packed/sequences.npy  (N, 30, 63) float32
+#   <data>/packed/labels.npy     (N,) int32, index into meta["actions"]
+#   <data>/packed/meta.json      actions, shapes, and which recordings are packed
+#                                ("files": row, size and mtime of each data/<Action>/N.npy)
+PACKED_DIR = 'packed'
+SEQUENCES_FILE = 'sequences.npy'
+LABELS_FILE = 'labels.npy'
+META_FILE = 'meta.json'
+
+# Fixed .npy header size, so the shape can grow in place when appending
+_NPY_HEADER_LEN = 128
+
+
+def _write_npy_header(f, shape, dtype):
+    header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (
+        np.lib.format.dtype_to_descr(np.dtype(dtype)), tuple(shape))
+    prefix = b'\x93NUMPY\x01\x00' + struct.pack('<H', _NPY_HEADER_LEN - 10)
+    padding = _NPY_HEADER_LEN - len(prefix) - len(header) - 1
+    if padding < 0:
+        raise ValueError(f"shape {shape} does not fit the fixed npy header")
+    f.seek(0)
+    f.write(prefix + header.encode('latin1') + b' ' * padding + b'\n')
+
+
+def _read_npy_header(f, path):
+    """Shape and dtype of a .npy written by this module (f positioned at 0)."""
+    version = np.lib.format.read_magic(f)
+    if version != (1, 0):
+        raise ValueError(f"{path} was not written by pack_data; repack it")
+    shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+    if f.tell() != _NPY_HEADER_LEN:
+        raise ValueError(f"{path} was not written by pack_data; repack it")
+    return shape, dtype
+
+
+def _row_bytes(shape, dtype):
+    return int(np.prod(shape[1:], dtype=np.int64)) * np.dtype(dtype).itemsize
+
+
+def _trim_npy(path, rows):
+    """Cut a .npy written by this module back to its first `rows` rows (drops an interrupted append)."""
+    if not os.path.exists(path):
+        if rows:
+            raise ValueError(f"{path} is missing but meta.json lists {rows} rows; repack it")
+        return
+    with open(path, 'r+b') as f:
+        shape, dtype = _read_npy_header(f, path)
+        if shape[0] < rows:
+            raise ValueError(f"{path} has {shape[0]} rows but meta.json lists {rows}; repack it")
+        f.truncate(_NPY_HEADER_LEN + rows * _row_bytes(shape, dtype))
+        if shape[0] != rows:
+            _write_npy_header(f, (rows,) + shape[1:], dtype)
+
+
+def _append_npy(path, array):
+    """Append rows to a .npy written by this module (creates it if missing)."""
+    array = np.ascontiguousarray(array)
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            _write_npy_header(f, array.shape, array.dtype)
+            f.write(array.tobytes())
+        return
+
+    with open(path, 'r+b') as f:
+        shape, dtype = _read_npy_header(f, path)
+        if shape[1:] != array.shape[1:] or dtype != array.dtype:
+            raise ValueError(f"cannot append {array.dtype}{array.shape[1:]} to {dtype}{shape[1:]}")
+        # Write right after the rows the header declares, never at EOF, so
+        # leftover bytes of an interrupted append are overwritten, not kept
+        end = _NPY_HEADER_LEN + shape[0] * _row_bytes(shape, dtype)
+        f.truncate(end)
+        f.seek(end)
+        f.write(array.tobytes())
+        _write_npy_header(f, (shape[0] + array.shape[0],) + shape[1:], dtype)
+
+
+def _packed_dir(data_path):
+    return os.path.join(data_path, PACKED_DIR)
+
+
+def _read_meta(packed_dir):
+    meta_path = os.path.join(packed_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        return json.load(f)
+
+
+def _write_meta(packed_dir, meta):
+    tmp_path = os.path.join(packed_dir, META_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(packed_dir, META_FILE))
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def append_packed(sequences, labels, data_path=DATA_PATH, sources=(), stamps=None):
+    """
+    Append recordings to the packed dataset.
+    sequences: (n, 30, 63), labels: (n,) indices into `actions`,
+    sources: optional ids (e.g. 'Hello/3.npy') remembered to skip re-packing,
+    stamps: optional size/mtime per source (one row each) so pack_data can
+    tell when that recording changes.
+    """
+    packed_dir = _packed_dir(data_path)
+    os.makedirs(packed_dir, exist_ok=True)
+    sequences = np.asarray(sequences, dtype=np.float32)
+    labels = np.asarray(labels, dtype=np.int32)
+
+    meta = _read_meta(packed_dir) or {
+        "actions": [str(a) for a in actions],
+        "sequence_length": int(sequences.shape[1]),
+        "features": int(sequences.shape[2]),
+        "count": 0,
+        "sources": [],
+        "files": {},
+    }
+    # meta.json is the commit point: first drop any rows an interrupted append
+    # left past meta["count"] in either file, so the two stay row-aligned
+    seq_path = os.path.join(packed_dir, SEQUENCES_FILE)
+    label_path = os.path.join(packed_dir, LABELS_FILE)
+    _trim_npy(seq_path, meta["count"])
+    _trim_npy(label_path, meta["count"])
+    _append_npy(seq_path, sequences)
+    _append_npy(label_path, labels)
+
+    if stamps is not None:
+        files = meta.setdefault("files", {})
+        for row, (source, stamp) in enumerate(zip(sources, stamps), start=meta["count"]):
+            files[source] = dict(stamp, row=row)
+    meta["count"] += len(sequences)
+    meta["sources"].extend(sources)
+    _write_meta(packed_dir, meta)
+
+
+def _update_rows(path, rows, array):
+    """Overwrite rows of a .npy written by this module in place."""
+    array = np.ascontiguousarray(array)
+    with open(path, 'r+b') as f:
+        shape, dtype = _read_npy_header(f, path)
+        if shape[1:] != array.shape[1:] or dtype != array.dtype:
+            raise ValueError(f"cannot write {array.dtype}{array.shape[1:]} into {dtype}{shape[1:]}")
+        row_bytes = _row_bytes(shape, dtype)
+        for row, values in zip(rows, array):
+            if row >= shape[0]:
+                raise ValueError(f"{path} has {shape[0]} rows, cannot update row {row}; repack it")
+            f.seek(_NPY_HEADER_LEN + row * row_bytes)
+            f.write(values.tobytes())
+
+
+def _scan_recordings(data_path, meta):
+    """
+    Compare data/<Action>/N.npy against meta.json.
+    Returns: (new, changed, untracked) lists of (source, path, label, stamp);
+    untracked = packed before meta.json recorded sizes/mtimes, so a change
+    to them cannot be detected.
+    """
+    label_map = {label:num for num, label in enumerate(actions)}
+    files = meta.get("files", {}) if meta else {}
+    done = set(meta["sources"]) if meta else set()
+
+    new, changed, untracked = [], [], []
+    for action in actions:
+        action_path = os.path.join(data_path, action)
+        if not os.path.exists(action_path):
+            continue
+        for file_name in sorted(os.listdir(action_path)):
+            if not file_name.endswith('.npy'):
+                continue
+            source = f"{action}/{file_name}"
+            path = os.path.join(action_path, file_name)
+            # Stat before reading, so a write racing the pack shows up next time
+            stamp = _stamp(path)
+            item = (source, path, label_map[action], stamp)
+            if source in files:
+                entry = files[source]
+                if (entry["size"], entry["mtime_ns"]) != (stamp["size"], stamp["mtime_ns"]):
+                    changed.append(item)
+            elif source in done:
+                untracked.append(item)
+            else:
+                new.append(item)
+    return new, changed, untracked
+
+
+def pack_data(data_path=DATA_PATH, batch_size=1024):
+    """
+    Pack data/<Action>/N.npy recordings into the consolidated format.
+    Incremental: new recordings are appended, recordings whose size or mtime
+    changed since they were packed are rewritten in place, the rest skipped.
+    Returns: (number of newly packed, number of repacked sequences).
+    """
+    packed_dir = _packed_dir(data_path)
+    meta = _read_meta(packed_dir)
+    new, changed, untracked = _scan_recordings(data_path, meta)
+    if untracked:
+        print(f"[dataset_loader] {len(untracked)} recordings were packed without size/mtime; "
+              f"changes to them are not detected (repack: python src/dataset_loader.py pack --rebuild)")
+
+    for start in range(0, len(new), batch_size):
+        chunk = new[start:start + batch_size]
+        sequences = np.stack([np.load(path) for _, path, _, _ in chunk])
+        append_packed(sequences, [label for _, _, label, _ in chunk], data_path,
+                      sources=[source for source, _, _, _ in chunk],
+                      stamps=[stamp for _, _, _, stamp in chunk])
+
+    for start in range(0, len(changed), batch_size):
+        chunk = changed[start:start + batch_size]
+        meta = _read_meta(packed_dir)
+        rows = [meta["files"][source]["row"] for source, _, _, _ in chunk]
+        sequences = np.stack([np.load(path) for _, path, _, _ in chunk]).astype(np.float32)
+        # Rows first, then meta.json: an interrupted update keeps the old
+        # stamps, so the next pack rewrites those rows again
+        _update_rows(os.path.join(packed_dir, SEQUENCES_FILE), rows, sequences)
+        _update_rows(os.path.join(packed_dir, LABELS_FILE), rows,
+                     np.array([label for _, _, label, _ in chunk], dtype=np.int32))
+        for source, _, _, stamp in chunk:
+            meta["files"][source].update(stamp)
+        _write_meta(packed_dir, meta)
+    return len(new), len(changed)
+
+
+def refresh_packed(data_path=DATA_PATH):
+    """
+    Bring an existing packed dataset up to date with data/<Action>/N.npy
+    (see pack_data) before it is read. No-op if the data is not packed.
+    """
+    if _read_meta(_packed_dir(data_path)) is None:
+        return
+    added, updated = pack_data(data_path)
+    if added or updated:
+        print(f"[dataset_loader] Packed {added} new and {updated} changed recordings")
+
+
+def rebuild_packed(data_path=DATA_PATH):
+    """Drop the packed dataset and pack data/<Action>/N.npy again.
+    Rows appended by other tools (e.g. ingest_videos) are not recreated."""
+    packed_dir = _packed_dir(data_path)
+    # meta.json first: without it the arrays are never read
+    for name in (META_FILE, SEQUENCES_FILE, LABELS_FILE):
+        path = os.path.join(packed_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    return pack_data(data_path)
+
+
+def load_packed(data_path=DATA_PATH, mmap=True):
+    """
+    Open the packed dataset. With mmap=True the sequences are a read-only
+    np.memmap (zero-copy, pages are read on demand).
+    Returns: (sequences, labels, meta) or (None, None, None) if not packed.
+    """
+    packed_dir = _packed_dir(data_path)
+    meta = _read_meta(packed_dir)
+    if meta is None:
+        return None, None, None
+    mode = 'r' if mmap else None
+    # meta.json is the source of truth: rows past meta["count"] (an interrupted
+    # append) are never visible, and the next append_packed trims them.
+    sequences = np.load(os.path.join(packed_dir, SEQUENCES_FILE), mmap_mode=mode)
+    labels = np.load(os.path.join(packed_dir, LABELS_FILE), mmap_mode=mode)
+    n = min(len(sequences), len(labels), meta["count"])
+    return sequences[:n], labels[:n], meta
+
+
+def load_sequences(data_path=DATA_PATH):
+    """
+    Whole dataset in memory, packed or not.
+    Returns: (X (N, 30, 63), integer labels (N,), found actions) or (None, None, None)
+    """
+    # Fast path: consolidated, memory-mapped dataset (first picking up
+    # recordings added or changed since it was packed)
+    refresh_packed(data_path)
+    X, labels, meta = load_packed(data_path)
+    if X is not None:
+        found_actions = [a for i, a in enumerate(meta["actions"]) if np.any(labels == i)]
+        print(f"Loaded packed data: {len(X)} sequences for actions: {found_actions}")
+        return X, np.asarray(labels), found_actions
+
     sequences, labels = [], []
     label_map = {label:num for num, label in enumerate(actions)}
-    
+
     # We will try to scan the directory for actions present
     found_actions = []
     for action in actions:
-        if os.path.exists(os.path.join(DATA_PATH, action)):
+        if os.path.exists(os.path.join(data_path, action)):
             found_actions.append(action)
-    
+
     if not found_actions:
-         print("No data found in d:/aiProject/data")
+         print(f"No data found in {data_path}")
          return None, None, None
 
     print(f"Loading data for actions: {found_actions}")
-    
+
     for action in found_actions:
-        action_path = os.path.join(DATA_PATH, action)
-        # List all npy files
-        file_list = [f for f in os.listdir(action_path) if f.endswith('.npy')]
-        
+        action_path = os.path.join(data_path, action)
+        # List all npy files, sorted: same order as pack_data on any filesystem,
+        # so a seeded split selects the same sequences on both paths
+        file_list = sorted(f for f in os.listdir(action_path) if f.endswith('.npy'))
+
         for file_name in file_list:
             res = np.load(os.path.join(action_path, file_name))
             sequences.append(res)
             labels.append(label_map[action])
-            
-    X = np.array(sequences)
-    y = to_categorical(labels).astype(int)
-    
+
+    return np.array(sequences), np.array(labels), found_actions
+
+
+def load_data():
+    from tensorflow.keras.utils import to_categorical
+
+    X, labels, found_actions = load_sequences(DATA_PATH)
+    if X is None:
+        return None, None, None
+    # One column per known action (the model's output size), even without samples yet
+    y = to_categorical(labels, num_classes=len(actions)).astype(int)
+
     return X, y, found_actions
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if a != "--rebuild"]
+    if args and args[0] == "pack":
+        data_path = args[1] if len(args) > 1 else DATA_PATH
+        if "--rebuild" in sys.argv:
+            added, updated = rebuild_packed(data_path)
+        else:
+            added, updated = pack_data(data_path)
+        _, _, meta = load_packed(data_path)
+        print(f"Packed {added} new and {updated} changed sequences "
+              f"({meta['count'] if meta else 0} total) into {_packed_dir(data_path)}")
+    else:
+        print("Usage: python src/dataset_loader.py pack [data_dir] [--rebuild]")
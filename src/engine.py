@@ -2,19 +2,58 @@
 import cv2
 import numpy as np
 import threading
-import queue
 import time
 import os
-from hand_tracking import HandDetector
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future
 from feature_extractor import extract_features
+from metrics import Histogram, REGISTRY, STAGE_SECONDS, span
+from model_backends import load_backend
+from ring_buffer import FeatureRingBuffer
+
+INFERENCES = REGISTRY.counter("signflow_inferences_total", "Windows run through the model.").labels()
+BATCHES = REGISTRY.counter("signflow_inference_batches_total", "Batched model calls.").labels()
+INFERENCE_ERRORS = REGISTRY.counter("signflow_inference_errors_total", "Batched model calls that raised.").labels()
+CAMERA_FRAMES_DROPPED = REGISTRY.counter(
+    "signflow_camera_frames_dropped_total", "Camera frames replaced before anything read them.").labels()
+
+# One captured camera frame: sequence number (1, 2, ...) and capture time
+# (time.perf_counter clock, taken right after the driver returned it).
+CameraFrame = namedtuple("CameraFrame", "image seq timestamp")
 
 class ThreadedCamera:
-    def __init__(self, src=0):
+    """
+    Background capture into a single latest-frame slot.
+
+    The reader thread always overwrites the slot with the newest frame, so
+    the consumer never works through a backlog; frames replaced before
+    anyone read them are counted in `dropped`. read_new() blocks until a
+    frame the caller has not seen yet arrives, so nothing downstream ever
+    processes the same image twice.
+
+    width / height / fps / fourcc (e.g. "MJPG": compressed USB transfer,
+    needed by many webcams for 720p+ at 30 fps) are requests to the driver;
+    it may pick the nearest mode it supports.
+    """
+    def __init__(self, src=0, width=None, height=None, fps=None, fourcc=None):
         self.capture = cv2.VideoCapture(src)
         self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        self.q = queue.Queue()
+        # FOURCC first: the available sizes / rates depend on it
+        if fourcc:
+            self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.capture.set(cv2.CAP_PROP_FPS, fps)
+        
+        self.cond = threading.Condition()
+        self.latest = None   # CameraFrame
+        self.last_seen = 0   # seq of the last frame handed out
+        self.dropped = 0
         self.status = False
-        self.frame = None
+        self.ended = False   # capture stopped delivering frames
         self.stopped = False
         
         self.thread = threading.Thread(target=self._reader)
@@ -22,73 +61,401 @@ class ThreadedCamera:
         self.thread.start()
 
     def _reader(self):
+        seq = 0
         while not self.stopped:
             status, frame = self.capture.read()
+            timestamp = time.perf_counter()
             if not status:
                 break
-            if not self.q.empty():
-                try:
-                    self.q.get_nowait()
-                except queue.Empty:
-                    pass
-            self.q.put(frame)
-            self.status = status
-            self.frame = frame
+            seq += 1
+            with self.cond:
+                if self.latest is not None and self.latest.seq > self.last_seen:
+                    self.dropped += 1
+                    CAMERA_FRAMES_DROPPED.inc()
+                self.latest = CameraFrame(frame, seq, timestamp)
+                self.status = True
+                self.cond.notify_all()
+        with self.cond:
+            self.ended = True
+            self.cond.notify_all()
 
     def read(self):
-        if not self.q.empty():
-             return self.status, self.q.get()
-        return self.status, self.frame
+        """Latest frame without waiting (may repeat the previous one): (status, image)."""
+        with self.cond:
+            if self.latest is None:
+                return self.status, None
+            self.last_seen = self.latest.seq
+            return self.status, self.latest.image
+
+    def read_new(self, timeout=None):
+        """
+        Block until a frame newer than the last one handed out is available.
+        Returns: CameraFrame, or None on timeout / once the capture has ended.
+        """
+        with self.cond:
+            ready = self.cond.wait_for(
+                lambda: (self.latest is not None and self.latest.seq > self.last_seen) or self.ended,
+                timeout=timeout)
+            if not ready or self.latest is None or self.latest.seq <= self.last_seen:
+                return None
+            self.last_seen = self.latest.seq
+            return self.latest
 
     def release(self):
         self.stopped = True
         self.capture.release()
+        with self.cond:
+            self.cond.notify_all()
+
+# A model output tagged with a monotonically increasing version and the
+# timestamp of the newest frame in the window it was computed from.
+Prediction = namedtuple("Prediction", "probs version timestamp")
+
+_Request = namedtuple("_Request", "window future enqueued timestamp")
+
 
 class PredictionEngine(threading.Thread):
-    def __init__(self, model_path, actions):
+    """
+    Shared model worker with a micro-batching scheduler.
+
+    Work comes in two flavours:
+      * predict_async(sequence, key): latest-only per session key, older
+        pending windows for the same key are replaced (stale frames).
+      * submit(sequence): every window is kept and its result is delivered
+        through a concurrent.futures.Future.
+
+    Each pass waits for the first window, then keeps gathering until
+    max_batch_size windows are pending or the oldest one has waited
+    max_wait_ms, and runs them through one batched model call.
+
+    model_workers=N runs the model in N worker processes (model_pool) with
+    one dispatcher thread each, so N batches are in flight at once;
+    0 keeps the model in this thread.
+    """
+    def __init__(self, model_path, actions, max_batch_size=32, max_wait_ms=0, backend="keras",
+                 backend_options=None, model_workers=0):
         super().__init__()
         self.model_path = model_path
+        self.backend = backend
+        self.backend_options = backend_options or {}
+        self.model_workers = model_workers
+        self.pool = None
         self.actions = actions
-        self.input_queue = queue.Queue()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.pending = OrderedDict()  # key -> _Request
+        self.results = {}             # session key -> latest Prediction
+        self.in_flight = {}           # session key -> windows taken by a running batch
+        self.discarded = set()        # keys discarded while a window was in flight
+        self.version = 0
+        self.cond = threading.Condition()
         self.latest_result = None 
+        self.saturated = False
+        
+        # Tuning signals for the latency/throughput tradeoff
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128])
+        self.queue_wait_ms = Histogram([1, 2, 5, 10, 20, 50, 100, 200, 500, 1000])
+        REGISTRY.register("signflow_inference_batch_size", "Windows per batched model call.", self.batch_sizes)
+        REGISTRY.register("signflow_inference_queue_wait_milliseconds",
+                          "Time a window waited in PredictionEngine before its batch ran.", self.queue_wait_ms)
+        
         self.daemon = True
         self.running = True
         self.start()
 
     def run(self):
-        print("[PredictionEngine] Loading TensorFlow...")
-        import tensorflow as tf
-        model = tf.keras.models.load_model(self.model_path)
-        print("[PredictionEngine] Model Loaded.")
+        if self.model_workers:
+            from model_pool import ModelWorkerPool
+            self.pool = ModelWorkerPool(self.model_path, self.model_workers, len(self.actions),
+                                        backend=self.backend, backend_options=self.backend_options,
+                                        max_batch=self.max_batch_size)
+            models = [self.pool.worker(i) for i in range(len(self.pool))]
+            print(f"[PredictionEngine] Model Loaded ({self.backend}, {len(models)} worker processes).")
+        else:
+            models = [load_backend(self.backend, self.model_path, **self.backend_options)]
+            print(f"[PredictionEngine] Model Loaded ({self.backend}).")
         
+        # One dispatcher per model: extra ones on their own threads, the first on this one
+        dispatchers = [threading.Thread(target=self._dispatch, args=(model,), daemon=True,
+                                        name=f"prediction-dispatcher-{i}")
+                       for i, model in enumerate(models[1:], 1)]
+        for t in dispatchers:
+            t.start()
+        self._dispatch(models[0])
+        for t in dispatchers:
+            t.join()
+        
+        if self.pool is not None:
+            self.pool.close()
+        self._cancel_pending()
+
+    def _dispatch(self, model):
         while self.running:
-            try:
-                sequence = self.input_queue.get(timeout=1)
-            except queue.Empty:
+            batch = self._gather()
+            if not batch:
                 continue
             
             try:
-                input_data = np.expand_dims(sequence, axis=0)
-                res = model(input_data, training=False).numpy()[0]
-                self.latest_result = res
+                input_data = np.stack([np.asarray(req.window, dtype=np.float32) for _, req in batch])
+                with span("inference"):
+                    res = model(input_data)
             except Exception as e:
+                INFERENCE_ERRORS.inc()
                 print(f"[PredictionEngine] Error: {e}")
+                with self.cond:
+                    for key, req in batch:
+                        if req.future is not None:
+                            if not req.future.cancelled():
+                                req.future.set_exception(e)
+                        else:
+                            self._finish(key)
+                continue
+            BATCHES.inc()
+            INFERENCES.inc(len(batch))
             
-            self.input_queue.task_done()
+            with self.cond:
+                for (key, req), probs in zip(batch, res):
+                    self.version += 1
+                    if req.future is not None:
+                        if not req.future.cancelled():
+                            req.future.set_result(probs)
+                    elif self._finish(key):  # False: session closed while its window ran
+                        # With several dispatchers an older window can finish last
+                        prev = self.results.get(key)
+                        if prev is None or prev.timestamp <= req.timestamp:
+                            self.results[key] = Prediction(probs, self.version, req.timestamp)
+                self.latest_result = res[-1]
 
-    def predict_async(self, sequence):
-        if not self.input_queue.empty():
-            try:
-                self.input_queue.get_nowait()
-            except queue.Empty:
-                pass
-        self.input_queue.put(sequence)
+    def _finish(self, key):
+        """A session window left the model (caller holds self.cond). Returns: False if key was discarded."""
+        count = self.in_flight[key] - 1
+        if count:
+            self.in_flight[key] = count
+            return key not in self.discarded
+        del self.in_flight[key]
+        if key in self.discarded:
+            self.discarded.remove(key)
+            return False
+        return True
+
+    def _gather(self):
+        """Block until work is available, then collect one batch (list of (key, _Request))."""
+        with self.cond:
+            while self.running and not self.pending:
+                self.cond.wait(timeout=1)
+            if not self.running:
+                return []
+            
+            if self.max_wait > 0:
+                oldest = next(iter(self.pending.values())).enqueued
+                deadline = oldest + self.max_wait
+                while self.running and len(self.pending) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(timeout=remaining)
+            
+            batch = []
+            while self.pending and len(batch) < self.max_batch_size:
+                key, req = self.pending.popitem(last=False)
+                if req.future is None:
+                    self.in_flight[key] = self.in_flight.get(key, 0) + 1
+                batch.append((key, req))
+            # Work left over after a full batch: the model can't keep up
+            self.saturated = bool(self.pending)
+        
+        now = time.perf_counter()
+        self.batch_sizes.observe(len(batch))
+        for _, req in batch:
+            self.queue_wait_ms.observe((now - req.enqueued) * 1000.0)
+        return batch
 
-    def get_result(self):
-        return self.latest_result
+    def predict_async(self, sequence, key=None, timestamp=None):
+        # Replace any window this session still has waiting, so we only process latest
+        now = time.perf_counter()
+        with self.cond:
+            self.discarded.discard(key)
+            self.pending.pop(key, None)
+            self.pending[key] = _Request(sequence, None, now, now if timestamp is None else timestamp)
+            self.cond.notify()
+
+    def submit(self, sequence):
+        """Queue a window without dropping anything; returns a Future of its probabilities."""
+        future = Future()
+        with self.cond:
+            now = time.perf_counter()
+            self.pending[future] = _Request(sequence, future, now, now)
+            self.cond.notify()
+        return future
+
+    def get_result(self, key=None):
+        """Latest Prediction for this session key (or None)."""
+        return self.results.get(key)
+
+    def discard(self, key):
+        """Forget a session's pending window and last result (client disconnected)."""
+        with self.cond:
+            self.pending.pop(key, None)
+            self.results.pop(key, None)
+            # A batch still running this key's window must not store its result
+            if key in self.in_flight:
+                self.discarded.add(key)
+
+    def stats(self):
+        return {
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+    def _cancel_pending(self):
+        with self.cond:
+            items, self.pending = list(self.pending.values()), OrderedDict()
+        for req in items:
+            if req.future is not None:
+                req.future.cancel()
 
     def stop(self):
         self.running = False
+        with self.cond:
+            self.cond.notify_all()
+
+
+class SignSession:
+    """
+    Per-client recognition state: rolling window, stability buffer and sentence.
+    Sessions share the detector and PredictionEngine of their SignLanguageSystem.
+    """
+    def __init__(self, system):
+        self.system = system
+        self.window = FeatureRingBuffer(system.sequence_length, 63)
+        self.stride = system.inference_stride
+        self.frames_since_dispatch = 0
+        self.last_version = 0
+        self.stream_state = system.streamer.new_state() if system.streamer else None
+        # Hand ROI of this client's video (roi_tracking), whichever detector runs it
+        self.roi_state = {} if system.roi_tracking else None
+        self.prediction_data = {"class": None, "confidence": 0.0}
+        # Smoothing: bounded history of (class index, frame timestamp). With a
+        # time-based hold it is bounded by age instead (see _on_result), so the
+        # hold covers hold_ms at any prediction rate.
+        self.predictions = deque(maxlen=None if system.hold_ms is not None else system.smoothing_window)
+        self.sentence = []
+        self.closed = False
+
+    def update(self, lmList, timestamp=None):
+        """
+        Features -> Prediction -> Logic for one frame's landmarks
+        (list or (21, 3) array; empty / None when no hand was found).
+        timestamp: frame capture/receive time (time.perf_counter clock).
+        Returns: (sentence, prediction_data)
+        """
+        system = self.system
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if lmList is not None and len(lmList):
+            # Normalize straight into the ring buffer row (no per-frame allocation)
+            with span("features"):
+                features = extract_features(lmList, out=self.window.slot())
+            self.window.advance()
+            
+            if system.streamer is not None:
+                # Streaming mode: advance this session's LSTM state by one frame
+                if self.window.is_full():
+                    with span("streaming_step"):
+                        probs = system.streamer.step(self.stream_state, features, self.window)
+                    INFERENCES.inc()
+                    self.last_version += 1
+                    self._on_result(Prediction(probs, self.last_version, timestamp))
+                return self.sentence, self.prediction_data
+            
+            self.frames_since_dispatch += 1
+            
+            # Consecutive windows overlap 29/30, so only predict every `stride` frames
+            if self.window.is_full() and self.frames_since_dispatch >= self.stride:
+                predictor = system.predictor
+                # Checked under the predictor lock close() takes, so a frame
+                # worker can never queue a window after discard() ran
+                with predictor.cond:
+                    if not self.closed:
+                        # Ordered (30, 63) copy is made only here, on dispatch
+                        predictor.predict_async(self.window.ordered(), key=self, timestamp=timestamp)
+                self.frames_since_dispatch = 0
+                if system.adaptive_stride:
+                    self.stride = system.next_stride(self.stride)
+        
+        if system.predictor is None:
+            return self.sentence, self.prediction_data
+        
+        # Check Result: only a new version counts towards stability
+        result = system.predictor.get_result(key=self)
+        if result is not None and result.version > self.last_version:
+            self.last_version = result.version
+            self._on_result(result)
+                
+        return self.sentence, self.prediction_data
+
+    def _is_stable(self, best_idx, timestamp):
+        system = self.system
+        if system.hold_ms is not None:
+            # Time-based hold: the class must have won every prediction for
+            # hold_ms of frame time, whatever the frame rate / model latency.
+            # A gap longer than hold_gap_ms (e.g. no hand) ends the run, so the
+            # hold needs continuous evidence.
+            run_start = timestamp
+            for idx, ts in reversed(self.predictions):
+                if idx != best_idx or (run_start - ts) * 1000.0 > system.hold_gap_ms:
+                    break
+                run_start = ts
+            return (timestamp - run_start) * 1000.0 >= system.hold_ms
+        
+        # Count-based hold: the last N independent predictions must agree
+        # (N shrinks as the stride grows so the hold stays ~0.3s of frames)
+        hold = system.stability_hold(self.stride)
+        if len(self.predictions) < hold:
+            return False
+        return all(self.predictions[-i][0] == best_idx for i in range(1, hold + 1))
+
+    def _on_result(self, result):
+        system = self.system
+        # Newest frame of the window (camera capture / WS receive) -> its result here
+        STAGE_SECONDS.labels("capture_to_result").observe(time.perf_counter() - result.timestamp)
+        res = result.probs
+        best_idx = np.argmax(res)
+        conf = res[best_idx]
+        self.prediction_data = {"class": None, "confidence": 0.0}
+        
+        self.predictions.append((best_idx, result.timestamp))
+        if system.hold_ms is not None:
+            # Older entries can never be part of a run that is still open
+            horizon = result.timestamp - (system.hold_ms + system.hold_gap_ms) / 1000.0
+            while self.predictions[0][1] < horizon:
+                self.predictions.popleft()
+        if self._is_stable(best_idx, result.timestamp): 
+            current_action = system.actions[best_idx]
+            required_conf = system.class_thresholds.get(current_action, system.threshold)
+            
+            if conf > required_conf: 
+                self.prediction_data = {"class": current_action, "confidence": float(conf)}
+                
+                # Sentence Logic
+                if len(self.sentence) > 0: 
+                    if current_action != self.sentence[-1]: 
+                        self.sentence.append(current_action)
+                else:
+                    self.sentence.append(current_action)
+                    
+        if len(self.sentence) > 5:
+            self.sentence = self.sentence[-5:]
+
+    def close(self):
+        predictor = self.system.predictor
+        if predictor is None:
+            self.closed = True
+            return
+        # predictor.cond is reentrant (Condition's default RLock)
+        with predictor.cond:
+            self.closed = True
+            predictor.discard(self)
 
 
 class SignLanguageSystem:
@@ -96,22 +463,57 @@ class SignLanguageSystem:
     Facade to manage the Camera, HandDetector, and PredictionEngine together.
     Useful for both the CLI script and the Web Backend.
     """
-    def __init__(self, model_path, actions, capture_source=0):
-        self.detector = HandDetector(detectionCon=0.8, maxHands=1, modelComplexity=0)
+    def __init__(self, model_path, actions, capture_source=0, max_batch_size=32, max_wait_ms=0,
+                 inference_stride=1, adaptive_stride=False, max_stride=8,
+                 hold_ms=None, hold_gap_ms=None, smoothing_window=32, streaming=None, reseed_every=5,
+                 backend="keras", headless=False, input_size=None, roi_tracking=False,
+                 backend_options=None, model_workers=0, capture_options=None):
+        # roi_tracking: run MediaPipe on a crop around the last hand (pays off
+        # on high-res input with one hand / one client per detector)
+        self.roi_tracking = roi_tracking
+        # Local camera / CLI detector, built on first use (the server's frame
+        # workers own theirs, so it never pays for this MediaPipe graph)
+        self._detector = None
+        # headless: never draw landmarks / keep annotated images (server path).
+        # input_size: (width, height) box frames are downscaled into before
+        # MediaPipe; frames that already fit are used as they are.
+        self.headless = headless
+        self.input_size = input_size
+        # capture_options: ThreadedCamera width / height / fps / fourcc
         self.camera = None
         if capture_source is not None:
-             self.camera = ThreadedCamera(capture_source)
+             self.camera = ThreadedCamera(capture_source, **(capture_options or {}))
         
-        self.predictor = PredictionEngine(model_path, actions)
+        # streaming="exact" / "approximate": per-session stateful LSTM (NumPy,
+        # one step per frame) instead of the windowed PredictionEngine.
+        self.streamer = None
+        self.predictor = None
+        if streaming:
+            from numpy_lstm import StreamingLSTM
+            self.streamer = StreamingLSTM.from_h5(model_path, mode=streaming, reseed_every=reseed_every)
+        else:
+            self.predictor = PredictionEngine(model_path, actions,
+                                              max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                                              backend=backend, backend_options=backend_options,
+                                              model_workers=model_workers)
         
-        self.sequence = []
         self.sequence_length = 30
         self.actions = actions
         
-        # Stability / Logic state
-        self.predictions = []
-        self.sentence = []
+        # Inference scheduling: dispatch a window every `inference_stride` frames.
+        # Adaptive mode raises a session's stride while the model is saturated
+        # and lowers it back towards inference_stride when it is idle.
+        self.inference_stride = max(1, inference_stride)
+        self.adaptive_stride = adaptive_stride
+        self.max_stride = max(self.inference_stride, max_stride)
+        
+        # Stability / Logic config (state lives in SignSession)
         self.threshold = 0.85 
+        self.stability_frames = 8  # ~0.3s of frames must agree
+        self.hold_ms = hold_ms     # time-based hold instead (e.g. 300), None = count-based
+        # Longest gap between agreeing predictions that still counts as one run
+        self.hold_gap_ms = hold_gap_ms if hold_gap_ms is not None else hold_ms
+        self.smoothing_window = smoothing_window
         
         # Per-class thresholds to prevent misfires
         self.class_thresholds = {
@@ -121,75 +523,108 @@ class SignLanguageSystem:
             "ThankYou": 0.85
         }
         
-    def process_frame(self, img):
+        # Session used by the local camera / CLI path
+        self.session = self.create_session()
+
+    @property
+    def detector(self):
+        if self._detector is None:
+            self._detector = self.make_detector()
+        return self._detector
+
+    def make_detector(self):
+        """Detector config shared by the facade and the backend's frame workers."""
+        # MediaPipe is imported here, so model-only users (benchmarks, training
+        # tools) can import engine without it
+        from hand_tracking import HandDetector
+        return HandDetector(detectionCon=0.8, maxHands=1, modelComplexity=0,
+                            roiTracking=self.roi_tracking)
+
+    def detect_landmarks(self, img, detector=None, roi_state=None):
+        """
+        Hand tracking stage only. Pass a worker-owned detector when calling from
+        another thread (MediaPipe objects must not be shared across threads),
+        and the session's roi_state so ROI tracking follows that client's hand.
+        Returns: (img, lmList)
+        """
+        detector = detector or self.detector
+        with span("resize"):
+            img = self.resize_input(img)
+        with span("hand_tracking"):
+            img = detector.findHands(img, draw=not self.headless, roiState=roi_state)
+        # (21, 3) float32 in a buffer owned by this detector, or None
+        lmList = detector.findPositionArray(out=detector.lmBuffer[0])
+        return img, lmList
+
+    def resize_input(self, img):
+        """Downscale (keeping aspect ratio) to fit input_size; no-op if it already fits."""
+        if self.input_size is None:
+            return img
+        h, w = img.shape[:2]
+        scale = min(self.input_size[0] / w, self.input_size[1] / h)
+        if scale >= 1.0:
+            return img
+        return cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))),
+                          interpolation=cv2.INTER_AREA)
+
+    def stability_hold(self, stride):
+        """Number of consecutive agreeing predictions required at this stride."""
+        return max(2, -(-self.stability_frames // stride))
+
+    def next_stride(self, stride):
+        if self.predictor is not None and self.predictor.saturated:
+            return min(stride * 2, self.max_stride)
+        if stride > self.inference_stride:
+            return stride - 1
+        return stride
+
+    def create_session(self):
+        """New independent recognition state (one per WebSocket client)."""
+        return SignSession(self)
+
+    @property
+    def sentence(self):
+        return self.session.sentence
+        
+    def process_frame(self, img, session=None, timestamp=None):
         """
         Core pipeline: Detection -> Features -> Prediction -> Logic.
-        Input: img (OpenCV frame)
+        Input: img (OpenCV frame), session (defaults to the local session),
+        timestamp (capture time, time.perf_counter clock; default: now)
         Returns: (processed_img, sentence, prediction_data)
         """
+        if session is None:
+            session = self.session
+
         if img is None:
-             return None, self.sentence, {}
+             return None, session.sentence, {}
 
         # Hand Tracking
-        img = self.detector.findHands(img)
-        lmList = self.detector.findPosition(img, draw=False)
-        
-        if lmList:
-            features = extract_features(lmList)
-            self.sequence.append(features)
-            self.sequence = self.sequence[-self.sequence_length:]
-            
-            if len(self.sequence) == self.sequence_length:
-                self.predictor.predict_async(self.sequence)
-        
-        # Check Result
-        res = self.predictor.get_result()
-        prediction_data = {"class": None, "confidence": 0.0}
+        img, lmList = self.detect_landmarks(img, roi_state=session.roi_state)
         
-        if res is not None:
-            best_idx = np.argmax(res)
-            conf = res[best_idx]
-            
-            self.predictions.append(best_idx)
-            if len(self.predictions) > 8:
-                # Optimized Stability: 8 frame hold required (~0.3s)
-                last_n = self.predictions[-8:]
-                if np.unique(last_n)[0] == best_idx: 
-                    current_action = self.actions[best_idx]
-                    required_conf = self.class_thresholds.get(current_action, self.threshold)
-                    
-                    if conf > required_conf: 
-                        prediction_data = {"class": current_action, "confidence": float(conf)}
-                        
-                        # Sentence Logic
-                        if len(self.sentence) > 0: 
-                            if current_action != self.sentence[-1]: 
-                                self.sentence.append(current_action)
-                        else:
-                            self.sentence.append(current_action)
-                            
-            if len(self.sentence) > 5:
-                self.sentence = self.sentence[-5:]
-                
-        return img, self.sentence, prediction_data
+        sentence, prediction_data = session.update(lmList, timestamp=timestamp)
+        return img, sentence, prediction_data
 
-    def get_frame(self):
+    def get_frame(self, timeout=1.0):
         """
         Legacy: Captures from local USB camera.
+        Waits up to timeout seconds for a frame that has not been processed
+        yet; returns img=None if none arrived.
         """
         if self.camera is None:
              raise RuntimeError("Camera not initialized in this instance")
 
-        success, img = self.camera.read()
-        if not success or img is None:
+        frame = self.camera.read_new(timeout=timeout)
+        if frame is None:
             return None, self.sentence, {}
             
         # Mirror for local view
-        img = cv2.flip(img, 1)
+        img = cv2.flip(frame.image, 1)
         
-        return self.process_frame(img)
+        return self.process_frame(img, timestamp=frame.timestamp)
 
     def release(self):
         if self.camera:
             self.camera.release()
-        self.predictor.stop()
+        if self.predictor:
+            self.predictor.stop()
@@ -0,0 +1,215 @@
+"""
+Export models/action.h5 to quantized TFLite variants and report
+accuracy / latency / size for each on the held-out split.
+
+    models/action_float32.tflite   plain conversion
+    models/action_float16.tflite   float16 weights
+    models/action_dynamic.tflite   dynamic-range: int8 weights, float activations
+    models/action_int8.tflite      full integer: int8 weights and activations
+    models/action_int16x8.tflite   full integer: int8 weights, int16 activations
+                                   (both calibrated on the training split; float I/O)
+    models/action.onnx             with --onnx: ONNX copy for ONNX Runtime
+                                   (needs: pip install -r requirements-export.txt)
+    models/export_report.json
+
+The relu LSTM's activations have a wide range, so check the report before
+serving int8: with 8-bit activations this model can lose most of its
+accuracy, while int16x8 keeps it.
+
+Serve one with SIGNFLOW_MODEL_BACKEND=tflite-<variant> or onnx (see model_backends).
+
+    python src/export_model.py
+    python src/export_model.py --variants dynamic int8 --data data
+    python src/export_model.py --variants --onnx
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from dataset_loader import DATA_PATH, load_sequences
+
+VARIANTS = ("float32", "float16", "dynamic", "int8", "int16x8")
+CALIBRATION_SAMPLES = 200
+ONNX_OPSET = 17
+
+
+def tflite_path(model_path, variant):
+    return f"{os.path.splitext(model_path)[0]}_{variant}.tflite"
+
+
+def unrolled_copy(model):
+    """
+    Same network with unroll=True on every LSTM. The converter cannot lower
+    the LSTM while-loop with a dynamic batch size; unrolled, it becomes
+    plain FullyConnected / elementwise ops that every variant can quantize.
+    """
+    import tensorflow as tf
+
+    config = model.get_config()
+    for layer in config["layers"]:
+        if layer["class_name"] == "LSTM":
+            layer["config"]["unroll"] = True
+    clone = tf.keras.Sequential.from_config(config)
+    clone.set_weights(model.get_weights())
+    return clone
+
+
+def convert(model, variant, calibration=None):
+    """TFLite flatbuffer bytes for one variant. calibration: float32 (N, 30, 63), int8 / int16x8 only."""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(unrolled_copy(model))
+    if variant == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == "dynamic":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant in ("int8", "int16x8"):
+        if calibration is None or len(calibration) == 0:
+            raise ValueError(f"{variant} export needs calibration data")
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([calibration[i:i + 1]] for i in range(len(calibration)))
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8 if variant == "int8"
+            else tf.lite.OpsSet.EXPERIMENTAL_TFLITE_BUILTINS_ACTIVATIONS_INT16_WEIGHTS_INT8]
+    elif variant != "float32":
+        raise ValueError(f"unknown variant {variant!r} (choose from {', '.join(VARIANTS)})")
+    return converter.convert()
+
+
+def onnx_path(model_path):
+    return os.path.splitext(model_path)[0] + ".onnx"
+
+
+def export_onnx(model, out_path, opset=ONNX_OPSET):
+    """
+    Convert through a tf.function with a fixed signature (float32, dynamic
+    batch); tf2onnx maps each Keras LSTM to a single ONNX LSTM op.
+    """
+    import tensorflow as tf
+    import tf2onnx
+
+    spec = [tf.TensorSpec((None, 30, 63), tf.float32, name="input")]
+    forward = tf.function(lambda x: model(x, training=False), input_signature=spec)
+    tf2onnx.convert.from_function(forward, input_signature=spec, opset=opset, output_path=out_path)
+    return out_path
+
+
+def _latency_ms(model, x, repeats=50):
+    """Median ms per call for input x (after one warm-up call)."""
+    model(x)
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        model(x)
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times) * 1e3)
+
+
+def evaluate(model, X_val, y_val, reference=None, batch_size=32):
+    """Accuracy, agreement with the reference probabilities, and latency."""
+    probs = model(X_val)
+    stats = {
+        "accuracy": float((probs.argmax(1) == y_val).mean()) if len(y_val) else None,
+        "latency_ms_batch1": _latency_ms(model, X_val[:1]),
+        f"latency_ms_batch{batch_size}": _latency_ms(model, np.resize(X_val, (batch_size,) + X_val.shape[1:])),
+    }
+    if reference is not None:
+        stats["max_abs_diff"] = float(np.abs(probs - reference).max())
+        stats["argmax_agreement"] = float((probs.argmax(1) == reference.argmax(1)).mean())
+    return stats
+
+
+def export(model_path, variants=VARIANTS, data_path=DATA_PATH, val_fraction=0.1, seed=0, onnx=False):
+    """
+    Write the requested TFLite variants (and action.onnx if onnx) next to
+    model_path and a report (export_report.json) comparing them with the
+    Keras model.
+    Returns: the report dict.
+    """
+    import tensorflow as tf
+    from data_pipeline import stratified_split
+    from model_backends import load_keras, OnnxModel, TFLiteModel
+
+    print(f"[Export] Loading {model_path}")
+    keras_model = tf.keras.models.load_model(model_path)
+
+    X, labels, _ = load_sequences(data_path)
+    if X is None:
+        raise RuntimeError(f"no data in {data_path}: needed for calibration and the report")
+    # Same deterministic split as data_pipeline / train_model, so the report is
+    # on data the model did not train on (if train_model trained it on this data)
+    train_idx, val_idx = stratified_split(labels, val_fraction, seed)
+    X_val, y_val = np.asarray(X[val_idx], np.float32), np.asarray(labels[val_idx])
+    rng = np.random.default_rng(seed)
+    calib_idx = np.sort(rng.choice(train_idx, min(CALIBRATION_SAMPLES, len(train_idx)), replace=False))
+    calibration = np.asarray(X[calib_idx], np.float32)
+
+    keras_fn = load_keras(model_path)
+    reference = keras_fn(X_val)
+    report = {
+        "model": os.path.basename(model_path),
+        "val_sequences": int(len(X_val)),
+        "split": {"val_fraction": val_fraction, "seed": seed,
+                  "note": "held out only for a model trained by train_model on this data with "
+                          "the same val_fraction / seed; otherwise accuracy may include training samples"},
+        "variants": {"keras": {"file": os.path.basename(model_path),
+                               "size_bytes": os.path.getsize(model_path),
+                               **evaluate(keras_fn, X_val, y_val)}},
+    }
+
+    for variant in variants:
+        out_path = tflite_path(model_path, variant)
+        print(f"[Export] Converting {variant} -> {out_path}")
+        flatbuffer = convert(keras_model, variant, calibration)
+        with open(out_path, "wb") as f:
+            f.write(flatbuffer)
+        report["variants"][variant] = {
+            "file": os.path.basename(out_path),
+            "size_bytes": len(flatbuffer),
+            **evaluate(TFLiteModel(out_path), X_val, y_val, reference),
+        }
+
+    if onnx:
+        out_path = onnx_path(model_path)
+        print(f"[Export] Converting onnx -> {out_path}")
+        export_onnx(keras_model, out_path)
+        report["variants"]["onnx"] = {
+            "file": os.path.basename(out_path),
+            "size_bytes": os.path.getsize(out_path),
+            **evaluate(OnnxModel(out_path), X_val, y_val, reference),
+        }
+
+    report_path = os.path.join(os.path.dirname(model_path), "export_report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"[Export] Report written to {report_path}")
+    return report
+
+
+def print_report(report):
+    split = report["split"]
+    print(f"\n{report['val_sequences']} held-out sequences "
+          f"(stratified_split val_fraction={split['val_fraction']} seed={split['seed']}: {split['note']})")
+    print(f"{'variant':10} {'size KB':>9} {'accuracy':>9} {'agree':>7} {'max |dp|':>9} {'ms @1':>7} {'ms @32':>7}")
+    for name, v in report["variants"].items():
+        acc = "-" if v["accuracy"] is None else f"{v['accuracy']:.1%}"
+        agree = f"{v['argmax_agreement']:.1%}" if "argmax_agreement" in v else "-"
+        diff = f"{v['max_abs_diff']:.1e}" if "max_abs_diff" in v else "-"
+        print(f"{name:10} {v['size_bytes'] / 1024:>9.0f} {acc:>9} {agree:>7} {diff:>9} "
+              f"{v['latency_ms_batch1']:>7.2f} {v['latency_ms_batch32']:>7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join('d:/aiProject/models', 'action.h5'))
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--variants", nargs="*", default=list(VARIANTS), choices=VARIANTS,
+                        help="TFLite variants (none: skip TFLite)")
+    parser.add_argument("--onnx", action="store_true", help="also convert to ONNX")
+    args = parser.parse_args()
+    export(args.model, args.variants, args.data, onnx=args.onnx)
@@ -1,36 +1,62 @@
 import numpy as np
 
-def extract_features(lmList):
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 3
+
+
+def extract_features(lmList, out=None):
     """
     Extracts normalized features from a list of 21 landmarks.
-    Expected lmList: list of [x, y, z] (normalized 0-1 from MediaPipe)
-    
+    Expected lmList: list of [x, y, z] (normalized 0-1 from MediaPipe), or a (21, 3) array
+
     Returns:
-        numpy array of shape (63,) containing centered and scaled coordinates.
-        Or vectors/angles if we choose that approach. 
+        float32 numpy array of shape (63,) containing centered and scaled coordinates.
+        Or vectors/angles if we choose that approach.
         For now, let's use relative coordinates to wrist (landmark 0) to be position invariant.
+        If out (a preallocated (63,) float32 array, e.g. a ring buffer row) is
+        given, the result is written into it and out is returned.
     """
-    if not lmList or len(lmList) != 21:
-        return np.zeros(63) # Return zero vector if no hand found or incomplete
+    if out is None:
+        out = np.empty(NUM_FEATURES, dtype=np.float32)
 
-    # Convert to numpy array
-    landmarks = np.array(lmList) # Shape (21, 3)
+    if lmList is None or len(lmList) != NUM_LANDMARKS:
+        out.fill(0.0) # Return zero vector if no hand found or incomplete
+        return out
+
+    # No copy when the caller already has a float32 (21, 3) array
+    landmarks = np.asarray(lmList, dtype=np.float32)
+    normalized = out.reshape(NUM_LANDMARKS, 3)
 
     # 1. Center to Wrist (Landmark 0)
-    wrist = landmarks[0]
-    centered_landmarks = landmarks - wrist
+    np.subtract(landmarks, landmarks[0], out=normalized)
 
     # 2. Scale Invariance
     # Find max distance from wrist to any other landmark to normalize size
-    distances = np.linalg.norm(centered_landmarks, axis=1)
-    max_dist = np.max(distances)
-    
+    max_dist = np.sqrt(np.max(np.einsum('ij,ij->i', normalized, normalized)))
+
     if max_dist > 0:
-        normalized_landmarks = centered_landmarks / max_dist
-    else:
-        normalized_landmarks = centered_landmarks
-
-    # Flatten
-    features = normalized_landmarks.flatten()
-    
-    return features
+        normalized /= max_dist
+
+    # out is the flattened view
+    return out
+
+
+def extract_features_batch(landmarks, out=None):
+    """
+    Vectorized extract_features for many hands at once.
+    landmarks: (N, 21, 3) array. Returns a contiguous float32 (N, 63) array
+    (written into out if given).
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    n = landmarks.shape[0]
+    if out is None:
+        out = np.empty((n, NUM_FEATURES), dtype=np.float32)
+    normalized = out.reshape(n, NUM_LANDMARKS, 3)
+
+    np.subtract(landmarks, landmarks[:, :1], out=normalized)
+
+    max_dist = np.sqrt(np.einsum('nij,nij->ni', normalized, normalized).max(axis=1))
+    # Degenerate hands (all landmarks on the wrist) stay un-scaled, like the single-hand path
+    scale = np.divide(1.0, max_dist, out=np.ones_like(max_dist), where=max_dist > 0)
+    normalized *= scale[:, None, None]
+    return out
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import REGISTRY
+
+FRAMES_DROPPED = REGISTRY.counter(
+    "signflow_frames_dropped_total", "Frames replaced in a connection's slot before being processed.").labels()
+
+
+class FramePool:
+    """
+    Bounded worker pool for the CPU-bound part of a frame (decode, MediaPipe,
+    features), so it never runs on the asyncio event loop.
+
+    MediaPipe's Hands object is not thread-safe, so every worker thread has
+    its own detector. Jobs get a get_detector() callable that builds it with
+    detector_factory() on first use, so jobs that never call it (client-side
+    landmarks) never start a MediaPipe graph.
+    workers=0 runs jobs inline on the caller (old behaviour, handy for A/B runs).
+    """
+    def __init__(self, detector_factory, workers=4):
+        self.detector_factory = detector_factory
+        self.workers = workers
+        self.local = threading.local()
+        self.executor = None
+        if workers > 0:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-worker")
+
+    def _detector(self):
+        detector = getattr(self.local, "detector", None)
+        if detector is None:
+            detector = self.detector_factory()
+            self.local.detector = detector
+        return detector
+
+    def _call(self, fn, args):
+        return fn(self._detector, *args)
+
+    async def run(self, fn, *args):
+        """Run fn(get_detector, *args) on a worker and await its result."""
+        if self.executor is None:
+            return self._call(fn, args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._call, fn, args)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LatestFrameSlot:
+    """
+    Single-slot mailbox between a connection's receive loop and its processor.
+    A new frame replaces one that has not been picked up yet instead of queuing
+    behind it, so a slow client never builds up a backlog.
+    """
+    def __init__(self):
+        self.item = None
+        self.event = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, item):
+        if self.item is not None:
+            self.dropped += 1
+            FRAMES_DROPPED.inc()
+        self.item = item
+        self.event.set()
+
+    async def get(self):
+        await self.event.wait()
+        self.event.clear()
+        item, self.item = self.item, None
+        return item
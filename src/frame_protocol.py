@@ -0,0 +1,129 @@
+"""
+Binary /ws frame protocol (replaces base64 data URLs inside JSON).
+
+Every binary message is a fixed little-endian header followed by the payload:
+
+    offset  size  field
+    0       2     magic b"SF"
+    2       1     version (1)
+    3       1     codec (CODEC_*)
+    4       4     sequence number (uint32, echoed back in the reply)
+    8       8     client timestamp in ms (uint64)
+    16      2     width  (0 = unknown)
+    18      2     height (0 = unknown)
+    20      ...   payload: raw JPEG / WebP bytes, or hand landmarks
+
+Landmark codecs carry the 21x3 MediaPipe landmarks (x, y, z row-major, 63
+values) computed on the client, so the server skips decoding and hand
+tracking. An empty landmark payload means "no hand in this frame".
+  * LANDMARKS_F32 / LANDMARKS_F16: little-endian floats
+  * LANDMARKS_I16: int16, value = round(coord * LANDMARK_SCALE)
+
+Text messages keep using the legacy JSON {"image": "data:image/jpeg;base64,..."}.
+"""
+import struct
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+MAGIC = b"SF"
+VERSION = 1
+HEADER = struct.Struct("<2sBBIQHH")
+
+CODEC_JPEG = 1
+CODEC_WEBP = 2
+IMAGE_CODECS = (CODEC_JPEG, CODEC_WEBP)
+
+CODEC_LANDMARKS_F32 = 16
+CODEC_LANDMARKS_F16 = 17
+CODEC_LANDMARKS_I16 = 18
+LANDMARK_DTYPES = {
+    CODEC_LANDMARKS_F32: np.dtype('<f4'),
+    CODEC_LANDMARKS_F16: np.dtype('<f2'),
+    CODEC_LANDMARKS_I16: np.dtype('<i2'),
+}
+LANDMARK_SCALE = 8192.0  # int16 step ~1.2e-4, range +-4.0 (normalized coords are ~0..1)
+NUM_LANDMARKS = 21
+
+FrameHeader = namedtuple("FrameHeader", "version codec seq timestamp_ms width height")
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def pack_frame(payload, seq, codec=CODEC_JPEG, width=0, height=0, timestamp_ms=None):
+    """Client side helper (load tests / benchmarks): header + payload bytes."""
+    if timestamp_ms is None:
+        timestamp_ms = int(time.time() * 1000)
+    header = HEADER.pack(MAGIC, VERSION, codec, seq & 0xFFFFFFFF, timestamp_ms, width, height)
+    return header + bytes(payload)
+
+
+def parse_header(buf):
+    """Validate and unpack the header of a received binary message."""
+    if len(buf) < HEADER.size:
+        raise ProtocolError(f"message too short ({len(buf)} bytes)")
+    magic, version, codec, seq, timestamp_ms, width, height = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ProtocolError("bad magic")
+    if version != VERSION:
+        raise ProtocolError(f"unsupported protocol version {version}")
+    if codec not in IMAGE_CODECS and codec not in LANDMARK_DTYPES:
+        raise ProtocolError(f"unknown codec {codec}")
+    return FrameHeader(version, codec, seq, timestamp_ms, width, height)
+
+
+def payload_view(buf):
+    """Payload as a uint8 array that aliases the received buffer (no copy)."""
+    return np.frombuffer(buf, dtype=np.uint8, offset=HEADER.size)
+
+
+def decode_image(buf):
+    """
+    Decode a binary image message straight from the received buffer.
+    Returns: (header, BGR image or None)
+    """
+    header = parse_header(buf)
+    if header.codec not in IMAGE_CODECS:
+        raise ProtocolError(f"unknown codec {header.codec}")
+    img = cv2.imdecode(payload_view(buf), cv2.IMREAD_COLOR)
+    return header, img
+
+
+def is_landmarks(header):
+    return header.codec in LANDMARK_DTYPES
+
+
+def pack_landmarks(landmarks, seq, codec=CODEC_LANDMARKS_F16, timestamp_ms=None):
+    """Client side helper: (21, 3) landmarks (or None for no hand) -> message."""
+    if landmarks is None:
+        return pack_frame(b"", seq, codec=codec, timestamp_ms=timestamp_ms)
+    values = np.asarray(landmarks, dtype=np.float32).reshape(-1)
+    if codec == CODEC_LANDMARKS_I16:
+        values = np.round(values * LANDMARK_SCALE)
+    return pack_frame(values.astype(LANDMARK_DTYPES[codec]).tobytes(), seq,
+                      codec=codec, timestamp_ms=timestamp_ms)
+
+
+def decode_landmarks(buf):
+    """
+    Unpack a landmark message.
+    Returns: (header, (21, 3) float32 array, or None when no hand was found)
+    """
+    header = parse_header(buf)
+    dtype = LANDMARK_DTYPES.get(header.codec)
+    if dtype is None:
+        raise ProtocolError(f"unknown codec {header.codec}")
+    size = len(buf) - HEADER.size
+    if size == 0:
+        return header, None
+    if size != NUM_LANDMARKS * 3 * dtype.itemsize:
+        raise ProtocolError(f"expected {NUM_LANDMARKS * 3} landmark values, got {size} bytes")
+    values = np.frombuffer(buf, dtype=dtype, offset=HEADER.size)
+    landmarks = values.astype(np.float32).reshape(NUM_LANDMARKS, 3)
+    if header.codec == CODEC_LANDMARKS_I16:
+        landmarks /= LANDMARK_SCALE
+    return header, landmarks
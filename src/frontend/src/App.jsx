@@ -6,6 +6,25 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 // Dynamic WebSocket URL based on API_URL
 const WS_URL = API_URL.replace(/^http/, 'ws') + '/ws';
 
+// Binary frame protocol v1 (see src/frame_protocol.py): 20-byte header + raw JPEG
+const FRAME_HEADER_SIZE = 20;
+const CODEC_JPEG = 1;
+
+function packFrame(jpegBuffer, seq, width, height) {
+  const msg = new Uint8Array(FRAME_HEADER_SIZE + jpegBuffer.byteLength);
+  const view = new DataView(msg.buffer);
+  view.setUint8(0, 0x53); // 'S'
+  view.setUint8(1, 0x46); // 'F'
+  view.setUint8(2, 1); // version
+  view.setUint8(3, CODEC_JPEG);
+  view.setUint32(4, seq >>> 0, true);
+  view.setBigUint64(8, BigInt(Date.now()), true);
+  view.setUint16(16, width, true);
+  view.setUint16(18, height, true);
+  msg.set(new Uint8Array(jpegBuffer), FRAME_HEADER_SIZE);
+  return msg.buffer;
+}
+
 function App() {
   const [data, setData] = useState({ sentence: '', prediction: -1, confidence: 0 });
   const [connected, setConnected] = useState(false);
@@ -115,6 +134,7 @@ function App() {
 
   // Frame Processing Loop (Ping-Pong Flow Control)
   const isProcessing = useRef(false);
+  const frameSeq = useRef(0);
 
   const sendFrame = () => {
     if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN && videoRef.current && canvasRef.current) {
@@ -124,9 +144,16 @@ function App() {
       const ctx = canvasRef.current.getContext('2d');
       // Resize to 320x240 for faster upload
       ctx.drawImage(videoRef.current, 0, 0, 320, 240);
-      const image = canvasRef.current.toDataURL('image/jpeg', 0.6);
-
-      wsRef.current.send(JSON.stringify({ image: image }));
+      canvasRef.current.toBlob(async (blob) => {
+        const ws = wsRef.current;
+        if (!blob || !ws || ws.readyState !== WebSocket.OPEN) {
+          isProcessing.current = false;
+          if (ws && ws.readyState === WebSocket.OPEN) setTimeout(sendFrame, 50);
+          return;
+        }
+        const jpeg = await blob.arrayBuffer();
+        ws.send(packFrame(jpeg, frameSeq.current++, 320, 240));
+      }, 'image/jpeg', 0.6);
     }
   };
 
@@ -1,9 +1,12 @@
 import cv2
 import mediapipe as mp
+import numpy as np
 import time
+from itertools import chain
 
 class HandDetector:
-    def __init__(self, mode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, trackCon=0.5):
+    def __init__(self, mode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, trackCon=0.5,
+                 roiTracking=False, roiPadding=0.6, roiMinSize=96):
         self.mode = mode
         self.maxHands = maxHands
         self.modelComplexity = modelComplexity
@@ -22,9 +25,46 @@ class HandDetector:
         self.hands = self.mpHands.Hands(self.mode, self.maxHands, self.modelComplexity,
                                         self.detectionCon, self.trackCon)
 
-    def findHands(self, img, draw=True):
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
+        # Reusable landmark buffer for findPositionArray / findAllPositionsArray
+        self.lmBuffer = np.empty((self.maxHands, 21, 3), dtype=np.float32)
+
+        # ROI tracking (single hand): after a full-frame detection, later frames
+        # only run MediaPipe on a padded crop around the hand. The crop is
+        # "sticky" (only moved when the hand nears its edge) so the crop-side
+        # Hands instance can keep tracking between frames.
+        # The ROI belongs to one video stream: callers serving several streams
+        # (e.g. one detector per worker thread, many clients) pass each
+        # stream's own state dict as findHands(roiState=...).
+        self.roiTracking = roiTracking and maxHands == 1
+        self.roiPadding = roiPadding
+        self.roiMinSize = roiMinSize
+        self.roiState = {}          # default stream: "roi" (x0, y0, w, h) px, "shape" (H, W)
+        self.lastRoiState = None    # stream the crop-side Hands instance last tracked
+        if self.roiTracking:
+            self.roiHands = self.mpHands.Hands(self.mode, self.maxHands, self.modelComplexity,
+                                               self.detectionCon, self.trackCon)
+
+    def findHands(self, img, draw=True, rgb=False, roiState=None):
+        self.results = None
+        if self.roiTracking:
+            state = self.roiState if roiState is None else roiState
+            if state is not self.lastRoiState:
+                # Another stream: the crop-side tracker's history is not about this one
+                self.roiHands.reset()
+                self.lastRoiState = state
+            if state.get("shape") != img.shape[:2]:
+                # ROI of a differently sized frame: meaningless here
+                state["roi"] = None
+            if state.get("roi") is not None:
+                self.results = self._processRoi(img, rgb, state)
+
+        if self.results is None:
+            # Full frame (first frame, ROI disabled, or tracking lost)
+            # rgb=True: caller already holds an RGB frame, skip the cvtColor copy
+            imgRGB = img if rgb else cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            self.results = self.hands.process(imgRGB)
+            if self.roiTracking:
+                self._updateRoi(img.shape, state, force=True)
 
         if self.results.multi_hand_landmarks:
             for handLms in self.results.multi_hand_landmarks:
@@ -32,6 +72,74 @@ class HandDetector:
                     self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
         return img
 
+    def _processRoi(self, img, rgb, state):
+        """Landmarks from the ROI crop, mapped to full-frame coords; None if lost."""
+        H, W = img.shape[:2]
+        x0, y0, w, h = state["roi"]
+        # Clamp to the frame and map with the size actually cropped
+        x0, y0 = min(max(x0, 0), W), min(max(y0, 0), H)
+        crop = img[y0:y0 + h, x0:x0 + w]
+        h, w = crop.shape[:2]
+        if w == 0 or h == 0:
+            state["roi"] = None
+            return None
+        cropRGB = np.ascontiguousarray(crop) if rgb else cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        results = self.roiHands.process(cropRGB)
+        if not results.multi_hand_landmarks:
+            state["roi"] = None
+            return None
+
+        # Back to full-frame normalized coordinates so extract_features sees
+        # the same input as with full-frame detection (z scales like x)
+        for handLms in results.multi_hand_landmarks:
+            for lm in handLms.landmark:
+                lm.x = (x0 + lm.x * w) / W
+                lm.y = (y0 + lm.y * h) / H
+                lm.z = lm.z * w / W
+        self.results = results
+        self._updateRoi(img.shape, state)
+        return results
+
+    def _updateRoi(self, shape, state, force=False):
+        hands = self.results.multi_hand_landmarks
+        H, W = shape[:2]
+        state["shape"] = (H, W)
+        if not hands:
+            state["roi"] = None
+            return
+        xs = [lm.x * W for lm in hands[0].landmark]
+        ys = [lm.y * H for lm in hands[0].landmark]
+        bx0, bx1, by0, by1 = min(xs), max(xs), min(ys), max(ys)
+        size = max(bx1 - bx0, by1 - by0)
+
+        if not force and state.get("roi") is not None:
+            # Keep the crop while the hand stays well inside it and about the same size
+            x0, y0, w, h = state["roi"]
+            margin = 0.15 * w
+            inside = (bx0 > x0 + margin and bx1 < x0 + w - margin and
+                      by0 > y0 + margin and by1 < y0 + h - margin)
+            if inside and 0.25 * w < size < 0.75 * w:
+                return
+
+        side = int(max(size * (1 + 2 * self.roiPadding), self.roiMinSize))
+        if side * side > 0.5 * W * H:
+            # Crop would not be much smaller than the frame: stay full-frame
+            state["roi"] = None
+            return
+        side = min(side, W, H)
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        x0 = int(min(max(cx - side / 2, 0), W - side))
+        y0 = int(min(max(cy - side / 2, 0), H - side))
+        state["roi"] = (x0, y0, side, side)
+
+    def reset(self):
+        """Forget tracking state, e.g. before the first frame of a new video."""
+        self.hands.reset()
+        if self.roiTracking:
+            self.roiHands.reset()
+        self.roiState = {}
+        self.lastRoiState = None
+
     def findPosition(self, img, handNo=0, draw=True):
         lmList = []
         if self.results.multi_hand_landmarks:
@@ -48,3 +156,32 @@ class HandDetector:
                     # if draw:
                     #     cv2.circle(img, (cx, cy), 5, (255, 0, 255), cv2.FILLED)
         return lmList
+
+    def findPositionArray(self, handNo=0, out=None):
+        """
+        Array version of findPosition: fills a (21, 3) float32 array (out, if
+        given, e.g. a buffer reused every frame) straight from the MediaPipe
+        result, without building Python lists.
+        Returns None when that hand was not found.
+        """
+        hands = self.results.multi_hand_landmarks
+        if not hands or handNo >= len(hands):
+            return None
+        if out is None:
+            out = np.empty((21, 3), dtype=np.float32)
+        out.reshape(-1)[:] = np.fromiter(
+            chain.from_iterable((lm.x, lm.y, lm.z) for lm in hands[handNo].landmark),
+            dtype=np.float32, count=63)
+        return out
+
+    def findAllPositionsArray(self, out=None):
+        """
+        All detected hands as a (hands, 21, 3) float32 array. out should hold
+        at least maxHands hands; the returned array is a view of its first rows.
+        """
+        hands = self.results.multi_hand_landmarks or []
+        if out is None:
+            out = np.empty((len(hands), 21, 3), dtype=np.float32)
+        for i in range(len(hands)):
+            self.findPositionArray(i, out=out[i])
+        return out[:len(hands)]
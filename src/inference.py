@@ -10,45 +10,7 @@ import win32com.client
 # import tensorflow as tf 
 from hand_tracking import HandDetector
 from feature_extractor import extract_features
-
-# --- Threaded Camera Class ---
-class ThreadedCamera:
-    def __init__(self, src=0):
-        self.capture = cv2.VideoCapture(src)
-        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1) # Mimimize buffer for lowest latency
-        self.q = queue.Queue()
-        self.status = False
-        self.frame = None
-        
-        # Start reading thread
-        self.thread = threading.Thread(target=self._reader)
-        self.thread.daemon = True
-        self.thread.start()
-
-    def _reader(self):
-        while True:
-            status, frame = self.capture.read()
-            if not status:
-                break
-            
-            # Keep only the latest frame
-            if not self.q.empty():
-                try:
-                    self.q.get_nowait()
-                except queue.Empty:
-                    pass
-            self.q.put(frame)
-            self.status = status
-            self.frame = frame
-
-    def read(self):
-        # Non-blocking read (returns latest or None if not ready)
-        if not self.q.empty():
-             return self.status, self.q.get()
-        return self.status, self.frame
-
-    def release(self):
-        self.capture.release()
+from engine import ThreadedCamera
 
 # --- Prediction Engine Thread ---
 class PredictionEngine(threading.Thread):
@@ -153,11 +115,13 @@ def main():
     predictor = PredictionEngine(model_path, actions)
 
     # Initialize Vision - Lite Mode
-    detector = HandDetector(detectionCon=0.8, maxHands=1, modelComplexity=0)
+    # ROI tracking: only the area around the last hand goes through MediaPipe
+    detector = HandDetector(detectionCon=0.8, maxHands=1, modelComplexity=0, roiTracking=True)
 
-    # Initialize Camera
-    camera = ThreadedCamera(0)
+    # Initialize Camera (MJPG: 640x480 @ 30 fps over USB without stalls)
+    camera = ThreadedCamera(0, width=640, height=480, fps=30, fourcc="MJPG")
 
+    lm_buffer = np.empty((21, 3), dtype=np.float32) # Reused every frame
     sequence = []
     sentence = []
     predictions = [] # for stability
@@ -173,23 +137,26 @@ def main():
     pTime = 0
 
     while True:
-        success, img = camera.read()
-        if not success or img is None:
-            time.sleep(0.01) # Yield if no camera
+        # Blocks until a frame we have not processed yet arrives
+        frame = camera.read_new(timeout=1.0)
+        if frame is None:
+            if camera.ended:
+                print("Camera stopped delivering frames.")
+                break
             continue
         
         # Mirror
-        img = cv2.flip(img, 1)
+        img = cv2.flip(frame.image, 1)
         
         # 1. Hand Tracking (Fast w/ Lite model)
         img = detector.findHands(img)
-        lmList = detector.findPosition(img, draw=False)
+        lmList = detector.findPositionArray(out=lm_buffer)
         
         # UI Header
         cv2.putText(img, "Zap Quick - Silky Smooth", (15, 20), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (100, 100, 100), 1, cv2.LINE_AA)
 
-        if lmList:
+        if lmList is not None:
             features = extract_features(lmList)
             sequence.append(features)
             sequence = sequence[-sequence_length:] # Keep last 30 frames
@@ -245,6 +212,10 @@ def main():
         fps = 1 / (cTime - pTime)
         pTime = cTime
         cv2.putText(img, f"FPS: {int(fps)}", (520, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
+        # Capture -> on screen, and frames the camera produced that we never got to
+        latency_ms = (time.perf_counter() - frame.timestamp) * 1000
+        cv2.putText(img, f"{int(latency_ms)} ms / {camera.dropped} dropped", (420, 55),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 1)
         
         cv2.imshow("Sign Language Translator", img)
         if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -0,0 +1,148 @@
+"""
+Batch ingest of recorded sign videos into the packed training dataset.
+
+The manifest is a CSV with a header row and the columns `path,label`
+(paths relative to the manifest's directory, labels from
+dataset_loader.actions). Every video is decoded, run through HandDetector
+and extract_features in a pool of worker processes (one MediaPipe instance
+each), cut into 30-frame windows and appended to <data>/packed/ with
+append_packed.
+
+Progress is stored with the data: each finished video is recorded in
+meta.json in the same write that adds its windows, so an interrupted run
+can simply be started again and skips the videos that are already done.
+
+    python src/ingest_videos.py videos/manifest.csv --workers 8
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+from dataset_loader import DATA_PATH, actions, append_packed, load_packed
+from feature_extractor import NUM_FEATURES, extract_features_batch
+
+SEQUENCE_LENGTH = 30
+SOURCE_PREFIX = "video:"
+
+_detector = None  # per worker process, created by _init_worker
+
+
+def read_manifest(manifest_path):
+    """Returns: list of (source id, absolute video path, label index)."""
+    label_map = {label: num for num, label in enumerate(actions)}
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    entries = []
+    with open(manifest_path, newline='') as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            path, label = row["path"].strip(), row["label"].strip()
+            if label not in label_map:
+                raise ValueError(f"{manifest_path}:{line_no}: unknown label {label!r} (expected one of {list(actions)})")
+            entries.append((SOURCE_PREFIX + path.replace(os.sep, '/'), os.path.join(base, path), label_map[label]))
+    return entries
+
+
+def _init_worker(detector_kwargs):
+    global _detector
+    from hand_tracking import HandDetector
+    _detector = HandDetector(**detector_kwargs)
+
+
+def _process_video(video_path, stride):
+    """
+    Runs in a worker. Frames without a hand are skipped, like the pause in
+    collect_data. Returns: (windows (n, 30, 63) float32, frames decoded, seconds)
+    """
+    t0 = time.perf_counter()
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"cannot open {video_path}")
+
+    _detector.reset()
+    landmarks = []
+    frames = 0
+    try:
+        while True:
+            success, img = cap.read()
+            if not success:
+                break
+            frames += 1
+            _detector.findHands(img, draw=False)
+            lm = _detector.findPositionArray()
+            if lm is not None:
+                landmarks.append(lm)
+    finally:
+        cap.release()
+
+    if len(landmarks) < SEQUENCE_LENGTH:
+        windows = np.empty((0, SEQUENCE_LENGTH, NUM_FEATURES), dtype=np.float32)
+    else:
+        features = extract_features_batch(np.stack(landmarks))
+        starts = range(0, len(features) - SEQUENCE_LENGTH + 1, stride)
+        windows = np.stack([features[s:s + SEQUENCE_LENGTH] for s in starts])
+    return windows, frames, time.perf_counter() - t0
+
+
+def ingest(manifest_path, data_path=DATA_PATH, workers=None, stride=SEQUENCE_LENGTH,
+           detector_kwargs=None):
+    """
+    Ingest every manifest video not yet in the packed dataset.
+    Returns: dict with videos, failed, windows, frames, seconds, fps.
+    """
+    workers = workers or os.cpu_count() or 1
+    detector_kwargs = detector_kwargs or {"detectionCon": 0.8, "maxHands": 1}
+
+    _, _, meta = load_packed(data_path)
+    done = set(meta["sources"]) if meta else set()
+    entries = read_manifest(manifest_path)
+    todo = [e for e in entries if e[0] not in done]
+    print(f"[Ingest] {len(entries)} videos in manifest, {len(entries) - len(todo)} already ingested, "
+          f"{len(todo)} to go on {workers} workers")
+
+    stats = {"videos": 0, "failed": 0, "windows": 0, "frames": 0}
+    t0 = time.perf_counter()
+    # spawn: MediaPipe / OpenCV threads do not survive fork()
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(detector_kwargs,)) as pool:
+        futures = {pool.submit(_process_video, path, stride): (source, label)
+                   for source, path, label in todo}
+        for future in as_completed(futures):
+            source, label = futures[future]
+            try:
+                windows, frames, seconds = future.result()
+            except Exception as e:
+                # Not recorded as done, so the next run retries it
+                stats["failed"] += 1
+                print(f"[Ingest] FAILED {source}: {e}")
+                continue
+
+            # Only this (main) process writes, one video per append
+            append_packed(windows, np.full(len(windows), label), data_path, sources=[source])
+            stats["videos"] += 1
+            stats["windows"] += len(windows)
+            stats["frames"] += frames
+            print(f"[Ingest] {stats['videos'] + stats['failed']}/{len(todo)} {source}: "
+                  f"{len(windows)} windows from {frames} frames ({frames / max(seconds, 1e-9):.0f} fps/worker)")
+
+    stats["seconds"] = time.perf_counter() - t0
+    stats["fps"] = stats["frames"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+    print(f"[Ingest] {stats['videos']} videos, {stats['windows']} windows, {stats['failed']} failed; "
+          f"{stats['frames']} frames in {stats['seconds']:.1f}s = {stats['fps']:.0f} fps on {workers} workers")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="CSV with path,label columns")
+    parser.add_argument("--data", default=DATA_PATH, help="dataset directory (packed/ is written inside it)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--stride", type=int, default=SEQUENCE_LENGTH,
+                        help="frames between window starts (default 30: non-overlapping)")
+    args = parser.parse_args()
+    ingest(args.manifest, args.data, args.workers, args.stride)
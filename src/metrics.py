@@ -0,0 +1,207 @@
+import bisect
+import threading
+import time
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram ("le" upper bounds, Prometheus style).
+    Cheap enough to call observe() on every frame / batch.
+    """
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q):
+        """Approximate quantile (linear interpolation inside the bucket)."""
+        with self.lock:
+            counts = list(self.counts)
+            total = self.count
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            if seen + c >= rank and c > 0:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+        return float(self.buckets[-1])
+
+    def snapshot(self):
+        with self.lock:
+            counts = list(self.counts)
+            total, s = self.count, self.sum
+        return {
+            "buckets": {str(b): c for b, c in zip(self.buckets + ["+Inf"], counts)},
+            "count": total,
+            "mean": s / total if total else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Counter:
+    """Monotonic counter (e.g. frames dropped, inferences run)."""
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that goes up and down (e.g. active sessions)."""
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set(self, value):
+        self.value = value
+
+
+# Stage latencies in seconds: 50us .. 1s
+STAGE_BUCKETS = [0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+
+
+class Family:
+    """
+    A named metric with optional labels; labels(*values) returns the child
+    metric (labels() with no values for an unlabeled family).
+    """
+    def __init__(self, kind, name, help, factory, labelnames=()):
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.factory = factory
+        self.labelnames = tuple(labelnames)
+        self.children = {}
+        self.lock = threading.Lock()
+        if not self.labelnames:
+            self.children[()] = factory()
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is not None:
+            return child
+        values = tuple(str(v) for v in values)
+        child = self.children.get(values)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(values, self.factory())
+        return child
+
+
+def _label_str(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def _num(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """Process-wide metric families, rendered in Prometheus text format."""
+    def __init__(self):
+        self.families = {}
+        self.lock = threading.Lock()
+
+    def _get(self, kind, name, help, factory, labelnames):
+        with self.lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = Family(kind, name, help, factory, labelnames)
+            return family
+
+    def counter(self, name, help, labelnames=()):
+        return self._get("counter", name, help, Counter, labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        return self._get("gauge", name, help, Gauge, labelnames)
+
+    def histogram(self, name, help, buckets=STAGE_BUCKETS, labelnames=()):
+        return self._get("histogram", name, help, lambda: Histogram(buckets), labelnames)
+
+    def register(self, name, help, metric):
+        """Expose an existing unlabeled Histogram / Counter / Gauge (replaces any previous one)."""
+        kind = {Histogram: "histogram", Counter: "counter", Gauge: "gauge"}[type(metric)]
+        family = Family(kind, name, help, lambda: metric)
+        with self.lock:
+            self.families[name] = family
+        return family
+
+    def render(self):
+        lines = []
+        with self.lock:
+            families = sorted(self.families.values(), key=lambda f: f.name)
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, metric in sorted(family.children.items()):
+                if family.kind != "histogram":
+                    lines.append(f"{family.name}{_label_str(family.labelnames, values)} {_num(metric.value)}")
+                    continue
+                with metric.lock:
+                    counts, total, s = list(metric.counts), metric.count, metric.sum
+                cumulative = 0
+                for bound, c in zip(metric.buckets + ["+Inf"], counts):
+                    cumulative += c
+                    le = ("le", bound if bound == "+Inf" else _num(float(bound)))
+                    lines.append(f"{family.name}_bucket{_label_str(family.labelnames, values, le)} {cumulative}")
+                labels = _label_str(family.labelnames, values)
+                lines.append(f"{family.name}_sum{labels} {_num(float(s))}")
+                lines.append(f"{family.name}_count{labels} {total}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "signflow_stage_seconds", "Time spent per frame pipeline stage.", labelnames=("stage",))
+
+
+class span:
+    """
+    Time a pipeline stage into signflow_stage_seconds{stage=...}:
+
+        with span("hand_tracking"):
+            ...
+    """
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, stage):
+        self.histogram = STAGE_SECONDS.labels(stage)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
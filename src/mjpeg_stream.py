@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+
+import cv2
+
+from metrics import REGISTRY, span
+
+STREAM_FRAMES = REGISTRY.counter("signflow_stream_frames_total", "Frames encoded for /video_feed.").labels()
+STREAM_DROPPED = REGISTRY.counter(
+    "signflow_stream_frames_dropped_total", "Encoded frames a slow /video_feed viewer skipped.").labels()
+STREAM_VIEWERS = REGISTRY.gauge("signflow_stream_viewers", "Open /video_feed connections.").labels()
+
+BOUNDARY = "frame"
+
+
+class _Subscriber:
+    """One viewer: holds only the newest encoded frame it has not sent yet."""
+    def __init__(self):
+        self.item = None
+        self.event = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, item):
+        if self.item is not None:
+            self.dropped += 1
+            STREAM_DROPPED.inc()
+        self.item = item
+        self.event.set()
+
+    async def get(self):
+        await self.event.wait()
+        self.event.clear()
+        item, self.item = self.item, None
+        return item
+
+
+class MJPEGBroadcaster:
+    """
+    Encode-once MJPEG fan-out. A single producer thread captures, processes
+    and JPEG-encodes each frame once; the bytes are handed to every viewer on
+    the event loop. A viewer that is still sending the previous frame skips
+    to the newest one instead of queuing, so it never slows the others.
+
+    get_frame() -> image or None (no new frame yet). The producer only runs
+    while someone is watching, waits retry_interval after a None instead of
+    spinning, and never produces faster than max_fps.
+    quality: JPEG quality 0-100; size: (width, height) box frames are
+    downscaled into before encoding (None = as captured).
+    """
+    def __init__(self, get_frame, quality=80, size=None, max_fps=30, retry_interval=0.02):
+        self.get_frame = get_frame
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        self.size = size
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.retry_interval = retry_interval
+        self.subscribers = set()
+        self.loop = None
+        self.thread = None
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+
+    def encode(self, img):
+        if self.size is not None:
+            h, w = img.shape[:2]
+            scale = min(self.size[0] / w, self.size[1] / h)
+            if scale < 1.0:
+                img = cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))),
+                                 interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode('.jpg', img, self.params)
+        if not ok:
+            return None
+        return (b'--' + BOUNDARY.encode() + b'\r\nContent-Type: image/jpeg\r\nContent-Length: '
+                + str(len(buffer)).encode() + b'\r\n\r\n' + buffer.tobytes() + b'\r\n')
+
+    def _publish(self, part):
+        for subscriber in self.subscribers:
+            subscriber.put(part)
+
+    def _keep_running(self):
+        """Producer loop check. The exit decision is made under the lock, so
+        _start() either revives this thread or sees it gone, never both."""
+        with self.lock:
+            if self.stopped.is_set():
+                self.thread = None
+                return False
+            return True
+
+    def _produce(self):
+        while self._keep_running():
+            started = time.perf_counter()
+            try:
+                img = self.get_frame()
+            except Exception as e:
+                print(f"[MJPEG] Capture Error: {e}")
+                img = None
+            if img is None:
+                self.stopped.wait(self.retry_interval)
+                continue
+            with span("stream_encode"):
+                part = self.encode(img)
+            if part is None:
+                continue
+            STREAM_FRAMES.inc()
+            try:
+                self.loop.call_soon_threadsafe(self._publish, part)
+            except RuntimeError:
+                self._stop()  # event loop closed
+                continue
+            # Frame pacing: sleep (not spin) off the rest of the interval
+            self.stopped.wait(max(0.0, self.min_interval - (time.perf_counter() - started)))
+
+    def _start(self):
+        with self.lock:
+            self.stopped.clear()
+            # A producer that was told to stop but is still inside get_frame()
+            # just carries on: never two threads on the detector / session
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._produce, name="mjpeg-producer", daemon=True)
+            self.thread.start()
+
+    def _stop(self):
+        with self.lock:
+            self.stopped.set()
+
+    async def stream(self):
+        """Async generator of multipart MJPEG chunks for one viewer."""
+        self.loop = asyncio.get_running_loop()
+        subscriber = _Subscriber()
+        self.subscribers.add(subscriber)
+        STREAM_VIEWERS.inc()
+        self._start()
+        try:
+            while True:
+                yield await subscriber.get()
+        finally:
+            self.subscribers.discard(subscriber)
+            STREAM_VIEWERS.dec()
+            if not self.subscribers:
+                self._stop()
+            if subscriber.dropped:
+                print(f"[MJPEG] Viewer skipped {subscriber.dropped} frames")
+
+    def close(self):
+        self.subscribers.clear()
+        self._stop()
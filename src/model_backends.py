@@ -0,0 +1,118 @@
+"""
+Model backends for PredictionEngine. Each loader returns a callable that maps
+a float32 (batch, 30, 63) array to a (batch, classes) probability array.
+"""
+import os
+from functools import partial
+
+import numpy as np
+
+
+def load_keras(model_path):
+    print("[PredictionEngine] Loading TensorFlow...")
+    import tensorflow as tf
+    model = tf.keras.models.load_model(model_path)
+    return lambda batch: model(batch, training=False).numpy()
+
+
+def load_numpy(model_path):
+    # Pure NumPy forward pass: no TensorFlow import, weights cached as .npz
+    from numpy_lstm import NumpyLSTMModel
+    return NumpyLSTMModel.from_h5(model_path)
+
+
+class TFLiteModel:
+    """
+    TFLite interpreter (see export_model.py). The input is resized when the
+    batch size changes, so batches of any size run in one invoke().
+    """
+    def __init__(self, tflite_path, num_threads=None):
+        try:
+            # Standalone runtime: no full TensorFlow import
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+        self.interpreter = Interpreter(model_path=tflite_path, num_threads=num_threads)
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch = None
+
+    def __call__(self, batch):
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        if batch.shape[0] != self.batch:
+            self.interpreter.resize_tensor_input(self.input["index"], batch.shape)
+            self.interpreter.allocate_tensors()
+            self.batch = batch.shape[0]
+        self.interpreter.set_tensor(self.input["index"], batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output["index"]).copy()
+
+
+def load_tflite(model_path, variant="dynamic", num_threads=None):
+    # A .h5 path selects the exported sibling models/action_<variant>.tflite
+    if not model_path.endswith(".tflite"):
+        model_path = f"{os.path.splitext(model_path)[0]}_{variant}.tflite"
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"{model_path} not found; run python src/export_model.py first")
+    print(f"[PredictionEngine] Loading TFLite model {model_path}")
+    return TFLiteModel(model_path, num_threads=num_threads)
+
+
+class OnnxModel:
+    """
+    ONNX Runtime CPU session (see export_model.export_onnx). The batch
+    dimension is dynamic. intra_op_threads parallelize inside an op (the
+    LSTM / matmuls), inter_op_threads > 1 switch to parallel execution so
+    independent ops run concurrently (ONNX Runtime ignores the inter-op
+    pool in sequential mode); None keeps ONNX Runtime's defaults.
+    Needs onnxruntime (pip install -r requirements-export.txt).
+    """
+    def __init__(self, onnx_path, intra_op_threads=None, inter_op_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if intra_op_threads is not None:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads is not None:
+            options.inter_op_num_threads = inter_op_threads
+            if inter_op_threads > 1:
+                options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, batch):
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+def load_onnx(model_path, intra_op_threads=None, inter_op_threads=None):
+    # A .h5 path selects the converted sibling models/action.onnx
+    if not model_path.endswith(".onnx"):
+        model_path = os.path.splitext(model_path)[0] + ".onnx"
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"{model_path} not found; run python src/export_model.py --onnx first")
+    print(f"[PredictionEngine] Loading ONNX model {model_path}")
+    return OnnxModel(model_path, intra_op_threads, inter_op_threads)
+
+
+BACKENDS = {
+    "keras": load_keras,
+    "numpy": load_numpy,
+    "tflite": load_tflite,
+    "tflite-float32": partial(load_tflite, variant="float32"),
+    "tflite-float16": partial(load_tflite, variant="float16"),
+    "tflite-dynamic": partial(load_tflite, variant="dynamic"),
+    "tflite-int8": partial(load_tflite, variant="int8"),
+    "tflite-int16x8": partial(load_tflite, variant="int16x8"),
+    "onnx": load_onnx,
+}
+
+
+def load_backend(name, model_path, **options):
+    """options: backend specific, e.g. intra_op_threads for "onnx", num_threads for "tflite"."""
+    if name not in BACKENDS:
+        raise ValueError(f"unknown model backend {name!r} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](model_path, **options)
@@ -0,0 +1,270 @@
+"""
+Multi-process model workers for PredictionEngine (model_workers=N).
+
+Each worker process loads the model once (any model_backends backend) and
+owns one multiprocessing.shared_memory slot laid out as
+
+    input   (max_batch, 30, 63) float32
+    output  (max_batch, classes) float32
+
+The parent writes a batch into the input region and sends only the row
+count over a pipe; the worker runs the model and writes probabilities into
+the output region. No array is ever pickled.
+
+A monitor thread pings idle workers every health_interval seconds and
+restarts any worker that died or stopped answering; a call that hits a dead
+or hung worker raises WorkerError (the engine fails that batch's futures)
+and the worker is restarted right away.
+"""
+import multiprocessing
+import os
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from metrics import REGISTRY
+
+SEQUENCE_LENGTH = 30
+NUM_FEATURES = 63
+
+WORKER_RESTARTS = REGISTRY.counter(
+    "signflow_model_worker_restarts_total", "Model worker processes restarted after a crash or hang.").labels()
+
+# Thread pools of numeric libraries, pinned per worker so N workers use ~N cores
+_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+               "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS")
+# os.environ is process-wide: one worker start (or restart, from any pool's
+# monitor / dispatcher thread) at a time may swap these. Setting them in the
+# child instead would be too late, spawn imports numpy before _worker_main runs.
+_ENV_LOCK = threading.Lock()
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+def _slot_arrays(buf, max_batch, classes):
+    inp = np.ndarray((max_batch, SEQUENCE_LENGTH, NUM_FEATURES), dtype=np.float32, buffer=buf)
+    out = np.ndarray((max_batch, classes), dtype=np.float32, buffer=buf, offset=inp.nbytes)
+    return inp, out
+
+
+def _worker_main(model_path, backend, backend_options, shm_name, max_batch, classes, conn):
+    """Worker process loop: ("run", n) -> ("ok", None) | ("error", msg); ("ping",) -> ("pong",)."""
+    from model_backends import load_backend
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        inp, out = _slot_arrays(shm.buf, max_batch, classes)
+        try:
+            model = load_backend(backend, model_path, **backend_options)
+            model(inp[:1])  # first call builds the graph / allocates
+        except Exception as e:
+            conn.send(("error", f"model load failed: {e}"))
+            return
+        conn.send(("ready", os.getpid()))
+
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break
+            if msg[0] == "run":
+                n = msg[1]
+                try:
+                    out[:n] = model(inp[:n])
+                    conn.send(("ok", None))
+                except Exception as e:
+                    conn.send(("error", str(e)))
+            elif msg[0] == "ping":
+                conn.send(("pong",))
+            elif msg[0] == "stop":
+                break
+        del inp, out
+    finally:
+        shm.close()
+
+
+class _Worker:
+    """Parent-side handle of one worker process and its shared memory slot."""
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+        self.lock = threading.Lock()  # one call (or ping) at a time on the pipe
+        size = pool.max_batch * (SEQUENCE_LENGTH * NUM_FEATURES + pool.classes) * 4
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.inp, self.out = _slot_arrays(self.shm.buf, pool.max_batch, pool.classes)
+        self.process = None
+        self.conn = None
+        try:
+            self.start()
+        except BaseException:
+            del self.inp, self.out
+            self.shm.close()
+            self.shm.unlink()
+            raise
+
+    def start(self):
+        pool = self.pool
+        parent_conn, child_conn = pool.ctx.Pipe()
+        with _ENV_LOCK:
+            saved = {k: os.environ.get(k) for k in _THREAD_ENV}
+            if pool.threads_per_worker:
+                os.environ.update({k: str(pool.threads_per_worker) for k in _THREAD_ENV})
+            try:
+                self.process = pool.ctx.Process(
+                    target=_worker_main, name=f"model-worker-{self.index}", daemon=True,
+                    args=(pool.model_path, pool.backend, pool.backend_options, self.shm.name,
+                          pool.max_batch, pool.classes, child_conn))
+                self.process.start()
+            finally:
+                for k, v in saved.items():
+                    if v is None:
+                        os.environ.pop(k, None)
+                    else:
+                        os.environ[k] = v
+        child_conn.close()
+        self.conn = parent_conn
+
+        if not self.conn.poll(pool.load_timeout):
+            self.kill()
+            raise WorkerError(f"model worker {self.index} did not load within {pool.load_timeout}s")
+        try:
+            status, detail = self.conn.recv()
+        except EOFError:
+            status, detail = "error", "exited while loading the model"
+        if status != "ready":
+            self.kill()
+            raise WorkerError(f"model worker {self.index}: {detail}")
+        print(f"[ModelWorkerPool] Worker {self.index} ready (pid {detail})")
+
+    def kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def restart(self, reason):
+        print(f"[ModelWorkerPool] Restarting worker {self.index}: {reason}")
+        WORKER_RESTARTS.inc()
+        self.kill()
+        self.start()
+
+    def _request(self, msg, timeout):
+        """Send msg and wait for the reply; on a crash/hang restart the worker and raise."""
+        try:
+            self.conn.send(msg)
+            if self.conn.poll(timeout):
+                return self.conn.recv()
+            reason = f"no reply within {timeout}s"
+        except (EOFError, OSError, BrokenPipeError) as e:
+            reason = f"pipe closed ({e})"
+        if not self.process.is_alive():
+            reason = f"exited with code {self.process.exitcode}"
+        try:
+            self.restart(reason)
+        except WorkerError as e:
+            print(f"[ModelWorkerPool] {e}")
+        raise WorkerError(f"model worker {self.index} failed: {reason}")
+
+    def __call__(self, batch):
+        n = len(batch)
+        if n > self.pool.max_batch:
+            # Larger than the slot: run it in slot-sized pieces
+            return np.concatenate([self(batch[i:i + self.pool.max_batch])
+                                   for i in range(0, n, self.pool.max_batch)])
+        with self.lock:
+            if self.conn is None:
+                self.restart("not running")
+            self.inp[:n] = batch
+            status, detail = self._request(("run", n), self.pool.call_timeout)
+            if status != "ok":
+                raise WorkerError(f"model worker {self.index}: {detail}")
+            return self.out[:n].copy()
+
+    def check(self):
+        """Health check from the monitor thread; skipped while a batch is running."""
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            if self.conn is None or not self.process.is_alive():
+                code = self.process.exitcode if self.process is not None else None
+                self.restart(f"exited with code {code}")
+                return
+            try:
+                self._request(("ping",), self.pool.ping_timeout)
+            except WorkerError:
+                pass  # already restarted
+        except WorkerError as e:
+            print(f"[ModelWorkerPool] {e}")
+        finally:
+            self.lock.release()
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                try:
+                    self.conn.send(("stop",))
+                except (OSError, BrokenPipeError):
+                    pass
+            if self.process is not None:
+                self.process.join(timeout=5)
+            self.kill()
+            del self.inp, self.out
+            self.shm.close()
+            self.shm.unlink()
+
+
+class ModelWorkerPool:
+    """
+    N model worker processes. worker(i) is a callable with the usual backend
+    signature ((batch, 30, 63) -> (batch, classes)); give each PredictionEngine
+    dispatcher thread its own worker.
+    """
+    def __init__(self, model_path, workers, classes, backend="keras", backend_options=None,
+                 max_batch=32, threads_per_worker=1, health_interval=5.0,
+                 load_timeout=120.0, call_timeout=30.0, ping_timeout=10.0):
+        self.model_path = model_path
+        self.backend = backend
+        self.backend_options = backend_options or {}
+        self.classes = classes
+        self.max_batch = max_batch
+        self.threads_per_worker = threads_per_worker
+        self.load_timeout = load_timeout
+        self.call_timeout = call_timeout
+        self.ping_timeout = ping_timeout
+        # spawn: TensorFlow / MediaPipe threads in the server do not survive fork()
+        self.ctx = multiprocessing.get_context("spawn")
+        self.workers = []
+        try:
+            for i in range(workers):
+                self.workers.append(_Worker(self, i))
+        except Exception:
+            self.close()
+            raise
+
+        self.health_interval = health_interval
+        self.stopped = threading.Event()
+        self.monitor = threading.Thread(target=self._monitor, name="model-pool-monitor", daemon=True)
+        self.monitor.start()
+
+    def worker(self, index):
+        return self.workers[index]
+
+    def __len__(self):
+        return len(self.workers)
+
+    def _monitor(self):
+        while not self.stopped.wait(self.health_interval):
+            for worker in self.workers:
+                worker.check()
+
+    def close(self):
+        if hasattr(self, "stopped"):
+            self.stopped.set()
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
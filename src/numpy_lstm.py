@@ -0,0 +1,284 @@
+"""
+NumPy implementation of the sign model (LSTM x3 + Dense x3 from train_model.py),
+driven by the weights stored in models/action.h5.
+
+NumpyLSTMModel runs the usual 30-frame windowed forward pass (batched), and
+can cache the weights as a compact .npz so the h5 is only parsed once.
+StreamingLSTM keeps the recurrent state per session and advances it one
+frame at a time instead of re-running all 30 timesteps on every prediction.
+"""
+import json
+import os
+
+import numpy as np
+
+
+def _sigmoid(x):
+    # tanh form does not overflow for large negative x
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "hard_sigmoid": lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0),
+    "softmax": _softmax,
+}
+
+
+def _layer_weights(group):
+    """Collect kernel / recurrent_kernel / bias datasets under an h5 group."""
+    weights = {}
+
+    def visit(name, obj):
+        if hasattr(obj, "shape"):
+            key = name.split("/")[-1].split(":")[0]  # Keras 2 names end in ':0'
+            weights[key] = np.asarray(obj, dtype=np.float32)
+    group.visititems(visit)
+    return weights
+
+
+def load_h5_layers(model_path):
+    """
+    Read layer configs and weights out of a Keras .h5 file with h5py only
+    (no TensorFlow import). Returns a list of plain dicts.
+    """
+    import h5py
+
+    layers = []
+    with h5py.File(model_path, "r") as f:
+        config = f.attrs["model_config"]
+        if isinstance(config, bytes):
+            config = config.decode()
+        config = json.loads(config)
+        weights_root = f["model_weights"]
+
+        for layer in config["config"]["layers"]:
+            kind, cfg = layer["class_name"], layer["config"]
+            if kind not in ("LSTM", "Dense"):
+                continue  # InputLayer / Dropout are no-ops at inference
+            w = _layer_weights(weights_root[cfg["name"]])
+            entry = {
+                "type": kind,
+                "name": cfg["name"],
+                "activation": cfg.get("activation", "linear"),
+                "kernel": w["kernel"],
+                "bias": w.get("bias", np.zeros(w["kernel"].shape[1], np.float32)),
+            }
+            if kind == "LSTM":
+                entry["recurrent_activation"] = cfg.get("recurrent_activation", "sigmoid")
+                entry["return_sequences"] = cfg.get("return_sequences", False)
+                entry["recurrent_kernel"] = w["recurrent_kernel"]
+            layers.append(entry)
+    return layers
+
+
+_ARRAY_KEYS = ("kernel", "recurrent_kernel", "bias")
+
+
+def save_npz(layers, npz_path):
+    """Layer configs as JSON + weights as float32 arrays in one .npz."""
+    arrays, meta = {}, []
+    for i, layer in enumerate(layers):
+        meta.append({k: v for k, v in layer.items() if k not in _ARRAY_KEYS})
+        for key in _ARRAY_KEYS:
+            if key in layer:
+                arrays[f"{i}/{key}"] = layer[key]
+    np.savez(npz_path, meta=np.array(json.dumps(meta)), **arrays)
+
+
+def load_npz(npz_path):
+    with np.load(npz_path) as data:
+        layers = json.loads(str(data["meta"]))
+        for i, layer in enumerate(layers):
+            for key in _ARRAY_KEYS:
+                if f"{i}/{key}" in data:
+                    layer[key] = data[f"{i}/{key}"]
+    return layers
+
+
+def load_layers(model_path):
+    """
+    Layers for a model file. For an .h5, a sibling .npz cache is written on
+    first use and read instead of the h5 while it is up to date.
+    """
+    if model_path.endswith(".npz"):
+        return load_npz(model_path)
+    npz_path = os.path.splitext(model_path)[0] + ".npz"
+    if os.path.exists(npz_path) and os.path.getmtime(npz_path) >= os.path.getmtime(model_path):
+        return load_npz(npz_path)
+    layers = load_h5_layers(model_path)
+    try:
+        save_npz(layers, npz_path)
+    except OSError as e:
+        print(f"[numpy_lstm] Could not write weight cache {npz_path}: {e}")
+    return layers
+
+
+def lstm_step(layer, x, h, c, xw=None):
+    """
+    One Keras LSTM cell step for a batch. x: (B, F), h/c: (B, units).
+    xw: precomputed x @ kernel + bias (the input projection of a whole
+    sequence can be done in one matmul up front).
+    """
+    units = h.shape[-1]
+    act = ACTIVATIONS[layer["activation"]]
+    rec_act = ACTIVATIONS[layer["recurrent_activation"]]
+
+    if xw is None:
+        xw = x @ layer["kernel"] + layer["bias"]
+    z = xw + h @ layer["recurrent_kernel"]
+    # Keras gate order: input, forget, cell, output
+    i = rec_act(z[:, :units])
+    f = rec_act(z[:, units:2 * units])
+    g = act(z[:, 2 * units:3 * units])
+    o = rec_act(z[:, 3 * units:])
+    c = f * c + i * g
+    h = o * act(c)
+    return h, c
+
+
+class NumpyLSTMModel:
+    """Windowed forward pass over (batch, 30, 63) inputs."""
+    def __init__(self, layers):
+        self.layers = layers
+        self.lstm_layers = [l for l in layers if l["type"] == "LSTM"]
+        self.dense_layers = [l for l in layers if l["type"] == "Dense"]
+
+    @classmethod
+    def from_h5(cls, model_path):
+        return cls(load_layers(model_path))
+
+    def zero_states(self, batch=1):
+        return [(np.zeros((batch, l["recurrent_kernel"].shape[0]), np.float32),
+                 np.zeros((batch, l["recurrent_kernel"].shape[0]), np.float32))
+                for l in self.lstm_layers]
+
+    def run_sequence(self, x, states):
+        """
+        Advance every LSTM layer over x (B, T, F) starting from states.
+        Returns: (last top-layer output (B, units), new states)
+        """
+        seq = x
+        new_states = []
+        for layer, (h, c) in zip(self.lstm_layers, states):
+            # Input projection for every timestep in a single matmul;
+            # only the recurrent part has to run step by step.
+            xw = seq @ layer["kernel"] + layer["bias"]
+            outputs = []
+            for t in range(seq.shape[1]):
+                h, c = lstm_step(layer, None, h, c, xw=xw[:, t])
+                outputs.append(h)
+            seq = np.stack(outputs, axis=1)
+            new_states.append((h, c))
+        return seq[:, -1], new_states
+
+    def head(self, h):
+        """Dense layers on top of the last LSTM output."""
+        for layer in self.dense_layers:
+            h = ACTIVATIONS[layer["activation"]](h @ layer["kernel"] + layer["bias"])
+        return h
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        h, _ = self.run_sequence(x, self.zero_states(x.shape[0]))
+        return self.head(h)
+
+
+class StreamingState:
+    """Recurrent lanes of one session (see StreamingLSTM)."""
+    def __init__(self):
+        self.states = None   # per-layer (h, c), each (lanes, units); None until seeded
+        self.ages = None     # frames consumed by each lane
+        self.frames = 0      # frames seen since seeding
+
+
+class StreamingLSTM:
+    """
+    Stateful per-frame inference.
+
+    The model was trained on 30-frame windows starting from a zero state, and
+    its relu LSTM cells diverge if a single state is run indefinitely. So each
+    session keeps a few staggered "lanes": a new lane starts from a zero state
+    every reseed_every frames, all lanes advance together in one batched step
+    per frame, and the output comes from the oldest lane that has not seen
+    more than `window` frames.
+
+    mode="exact": reseed_every=1, one lane per frame of the window. The output
+        lane has seen exactly the last 30 frames, so results match windowed
+        inference; a frame costs one 30-row step instead of 30 one-row steps.
+    mode="approximate": a lane every reseed_every frames (ceil(30 / k) lanes),
+        so the output sees the last 30-k+1 .. 30 frames. Far cheaper, with a
+        small drift from windowed inference.
+    """
+    def __init__(self, model, mode="exact", reseed_every=5, window=30):
+        if mode not in ("exact", "approximate"):
+            raise ValueError(f"unknown streaming mode {mode!r}")
+        self.model = model
+        self.mode = mode
+        self.window = window
+        self.reseed_every = 1 if mode == "exact" else max(1, min(reseed_every, window))
+        self.lanes = -(-window // self.reseed_every)
+
+    @classmethod
+    def from_h5(cls, model_path, **kwargs):
+        return cls(NumpyLSTMModel.from_h5(model_path), **kwargs)
+
+    def new_state(self):
+        return StreamingState()
+
+    def _advance(self, state, x):
+        """Feed one frame (F,) to every lane, starting a fresh lane when due."""
+        if state.frames % self.reseed_every == 0:
+            lane = int(np.argmax(state.ages))  # recycle the oldest lane
+            for h, c in state.states:
+                h[lane] = 0.0
+                c[lane] = 0.0
+            state.ages[lane] = 0
+
+        inp = x[None]
+        new_states = []
+        for layer, (h, c) in zip(self.model.lstm_layers, state.states):
+            h, c = lstm_step(layer, inp, h, c)  # (1, F) input broadcasts over lanes
+            new_states.append((h, c))
+            inp = h
+        state.states = new_states
+        state.ages += 1
+        state.frames += 1
+
+    def _seed(self, state, window):
+        """(Re)build the lanes from the current window, as if streamed from its start."""
+        state.states = [(np.zeros((self.lanes, units), np.float32), np.zeros((self.lanes, units), np.float32))
+                        for units in (l["recurrent_kernel"].shape[0] for l in self.model.lstm_layers)]
+        # Lanes that "started" before the window would only see part of it;
+        # give them a huge age so they are recycled first.
+        state.ages = np.full(self.lanes, np.iinfo(np.int64).max // 2, dtype=np.int64)
+        state.frames = 0
+        for frame in window.ordered():
+            self._advance(state, frame)
+
+    def step(self, state, features, window):
+        """
+        Advance one session by one frame. features: (63,) newest frame,
+        window: FeatureRingBuffer ending with that frame (only read on seeding).
+        Returns: probability array
+        """
+        if state.states is None:
+            self._seed(state, window)
+        else:
+            self._advance(state, np.asarray(features, dtype=np.float32))
+
+        valid = np.where(state.ages <= self.window, state.ages, -1)
+        lane = int(np.argmax(valid))
+        h = state.states[-1][0][lane:lane + 1]
+        return self.model.head(h)[0]
+
+    def reset(self, state):
+        state.states = None
@@ -0,0 +1,79 @@
+"""
+Sampling profiler for production diagnosis (pure Python, no dependencies).
+
+A background thread snapshots every thread's Python stack with
+sys._current_frames() at a fixed interval and counts identical stacks.
+The result is either "collapsed" stacks (one `frame;frame;frame count` line
+per stack, the input format of flamegraph.pl / speedscope) or a flat top-N
+of the functions that were on CPU at sample time.
+
+Cost is one stack walk per thread per interval while a capture runs, and
+nothing otherwise.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def _frame_label(self, frame):
+        code = frame.f_code
+        return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})"
+
+    def _sample(self):
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[tuple(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def profile(self, seconds):
+        """Blocking capture (CLI / worker-thread use)."""
+        self.start()
+        time.sleep(seconds)
+        self.stop()
+        return self
+
+    def collapsed(self):
+        return "\n".join(f"{';'.join(stack)} {count}"
+                         for stack, count in self.stacks.most_common()) + "\n"
+
+    def top(self, limit=30):
+        """Functions by self samples (innermost frame of each stack)."""
+        leaf = Counter()
+        for stack, count in self.stacks.items():
+            leaf[stack[-1]] += count
+        total = sum(leaf.values()) or 1
+        lines = [f"{self.samples} samples every {self.interval * 1000:.1f} ms"]
+        for label, count in leaf.most_common(limit):
+            lines.append(f"{100.0 * count / total:6.2f}%  {count:7d}  {label}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class FeatureRingBuffer:
+    """
+    Fixed-size rolling window of feature vectors, stored in one contiguous
+    float32 (length, features) array. append() writes a row in place (no
+    allocation); ordered() builds the oldest -> newest copy only when a
+    window is actually dispatched for inference.
+    """
+    def __init__(self, length=30, features=63):
+        self.length = length
+        self.buffer = np.zeros((length, features), dtype=np.float32)
+        self.head = 0   # row the next append writes to
+        self.count = 0
+
+    def append(self, features):
+        self.buffer[self.head] = features
+        self.advance()
+
+    def slot(self):
+        """Row the next frame goes into, for producers that write in place
+        (e.g. extract_features(..., out=window.slot())); then call advance()."""
+        return self.buffer[self.head]
+
+    def advance(self):
+        self.head = (self.head + 1) % self.length
+        if self.count < self.length:
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def is_full(self):
+        return self.count == self.length
+
+    def ordered(self, out=None):
+        """Rows oldest -> newest, copied into out (allocated if not given)."""
+        if self.count < self.length:
+            # Not wrapped yet: rows 0..count-1 are already in order
+            if out is None:
+                return self.buffer[:self.count].copy()
+            out[:] = self.buffer[:self.count]
+            return out
+
+        if out is None:
+            out = np.empty_like(self.buffer)
+        tail = self.length - self.head
+        out[:tail] = self.buffer[self.head:]
+        out[tail:] = self.buffer[:self.head]
+        return out
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
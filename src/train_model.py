@@ -4,18 +4,39 @@ import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import TensorBoard
-from dataset_loader import load_data, actions
-from sklearn.model_selection import train_test_split
+from dataset_loader import load_data, actions, DATA_PATH
+from data_pipeline import make_datasets, stratified_split
 
-def train():
-    X, y, found_actions = load_data()
-    if X is None:
-        print("Dataset empty. Run collect_data.py first.")
-        return
+def train(augment_copies=0, export=False):
+    """
+    augment_copies: extra augmented copies of the training split (see augmentation.py)
+    export: also write the quantized TFLite variants and their report (see export_model.py)
+    """
+    # Packed dataset: stream it from disk (python src/dataset_loader.py pack)
+    train_ds, val_ds, info = make_datasets(DATA_PATH, augment_copies=augment_copies)
+    if train_ds is not None:
+        print(f"Streaming packed data: {info['train_size']} train / {info['val_size']} validation sequences")
+        fit_args = (train_ds,)
+        fit_kwargs = {'validation_data': val_ds}
+    else:
+        X, y, found_actions = load_data()
+        if X is None:
+            print("Dataset empty. Run collect_data.py first.")
+            return
 
-    print(f"Data shape: {X.shape}, Labels shape: {y.shape}")
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.1)
+        print(f"Data shape: {X.shape}, Labels shape: {y.shape}")
+
+        # Same deterministic, per-class split as the packed pipeline (and export_model's report)
+        train_idx, val_idx = stratified_split(y.argmax(axis=1))
+        X_train, X_test, y_train, y_test = X[train_idx], X[val_idx], y[train_idx], y[val_idx]
+        if augment_copies:
+            from augmentation import Augmenter
+            augmenter = Augmenter()
+            rng = np.random.default_rng(augmenter.seed)
+            X_train = np.concatenate([X_train] + [augmenter(X_train, rng) for _ in range(augment_copies)])
+            y_train = np.tile(y_train, (augment_copies + 1, 1))
+        fit_args = (X_train, y_train)
+        fit_kwargs = {'validation_data': (X_test, y_test)}
 
     model = Sequential()
     # 63 features (21 landmarks * 3 coords)
@@ -31,7 +52,7 @@ def train():
     log_dir = os.path.join('Logs')
     tb_callback = TensorBoard(log_dir=log_dir)
 
-    model.fit(X_train, y_train, epochs=100, callbacks=[tb_callback], validation_data=(X_test, y_test))
+    model.fit(*fit_args, epochs=100, callbacks=[tb_callback], **fit_kwargs)
     
     model.summary()
     
@@ -42,5 +63,16 @@ def train():
     model.save(model_path)
     print(f"Model saved to {model_path}")
 
+    if export:
+        from export_model import export as export_tflite
+        export_tflite(model_path)
+
 if __name__ == "__main__":
-    train()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--augment", type=int, default=0,
+                        help="number of augmented copies of the training data")
+    parser.add_argument("--export", action="store_true",
+                        help="export quantized TFLite variants after training")
+    args = parser.parse_args()
+    train(args.augment, args.export)